@@ -7,11 +7,15 @@ for the Claude Code Observatory project. Follows the patterns from the supabase-
 
 import os
 import logging
+import threading
 from typing import Optional
 from supabase import create_client, Client
 
 logger = logging.getLogger(__name__)
 
+# Guards client creation so concurrent first calls build each client once
+_client_lock = threading.Lock()
+
 
 class SupabaseConfig:
     """Configuration class for Supabase client settings."""
@@ -52,12 +56,17 @@ class SupabaseClientManager:
         Raises:
             ValueError: If configuration is invalid
         """
-        if not self.config.validate():
-            raise ValueError("Invalid Supabase configuration")
+        # Fast path: an existing client was validated when it was created
+        if self._client is not None:
+            return self._client
+
+        with _client_lock:
+            if self._client is None:
+                if not self.config.validate():
+                    raise ValueError("Invalid Supabase configuration")
 
-        if self._client is None:
-            logger.info("Initializing Supabase client")
-            self._client = create_client(self.config.url, self.config.key)
+                logger.info("Initializing Supabase client")
+                self._client = create_client(self.config.url, self.config.key)
 
         return self._client
 
@@ -73,16 +82,20 @@ class SupabaseClientManager:
         Raises:
             ValueError: If service role key is not configured
         """
-        if not self.config.service_role_key:
-            raise ValueError(
-                "SUPABASE_SERVICE_ROLE_KEY environment variable is required"
-            )
-
-        if self._service_client is None:
-            logger.info("Initializing Supabase service client")
-            self._service_client = create_client(
-                self.config.url, self.config.service_role_key
-            )
+        if self._service_client is not None:
+            return self._service_client
+
+        with _client_lock:
+            if self._service_client is None:
+                if not self.config.service_role_key:
+                    raise ValueError(
+                        "SUPABASE_SERVICE_ROLE_KEY environment variable is required"
+                    )
+
+                logger.info("Initializing Supabase service client")
+                self._service_client = create_client(
+                    self.config.url, self.config.service_role_key
+                )
 
         return self._service_client
 
@@ -30,6 +30,10 @@ from .performance_monitor import PerformanceMonitor
 
 logger = logging.getLogger(__name__)
 
+# Native event API watchdog selected for this platform ("inotify", "fsevents",
+# "kqueue", "read_directory_changes"), or "polling" when none is available
+OBSERVER_BACKEND = Observer.__module__.rsplit(".", 1)[-1]
+
 
 class FileMonitorError(Exception):
     """Exception raised by FileMonitor for startup/shutdown errors."""
@@ -78,6 +82,8 @@ class FileMonitor:
         # State management
         self._running = False
         self._lock = threading.Lock()
+        # Set once the observer's watches are registered; cleared on stop
+        self.started = threading.Event()
 
         # Statistics
         self.stats = {
@@ -110,6 +116,8 @@ class FileMonitor:
 
                 # Start watchdog observer
                 self.observer = Observer()
+                # Daemon so a stuck observer can never keep the process alive
+                self.observer.daemon = True
                 self.observer.schedule(
                     self.file_handler, str(self.watch_path), recursive=True
                 )
@@ -117,6 +125,7 @@ class FileMonitor:
 
                 self._running = True
                 self._start_time = time.time()
+                self.started.set()
 
                 logger.info(
                     f"FileMonitor started, monitoring {self.watch_path} recursively"
@@ -131,35 +140,38 @@ class FileMonitor:
         """
         Stop the file monitoring service.
 
-        Gracefully shuts down the watchdog observer and cleans up resources.
+        The lock only guards the running-state transition; the observer is
+        signalled and joined outside it so teardown never blocks other
+        callers waiting on the lock.
         """
         with self._lock:
             if not self._running:
                 logger.warning("FileMonitor is not running")
                 return
 
-            try:
-                if self.observer:
-                    self.observer.stop()
-                    self.observer.join(timeout=5.0)  # Wait up to 5 seconds
+            self._running = False
+            self.started.clear()
+            observer = self.observer
 
-                    if self.observer.is_alive():
-                        logger.warning(
-                            "Observer did not stop gracefully within timeout"
-                        )
-                    else:
-                        logger.info("Observer stopped gracefully")
+        try:
+            if observer:
+                observer.stop()
+                observer.join(timeout=5.0)  # Wait up to 5 seconds
 
-                self._running = False
-                if self._start_time:
-                    self.stats["uptime_seconds"] = int(time.time() - self._start_time)
+                if observer.is_alive():
+                    logger.warning("Observer did not stop gracefully within timeout")
+                else:
+                    logger.info("Observer stopped gracefully")
 
-                logger.info("FileMonitor stopped")
+            if self._start_time:
+                self.stats["uptime_seconds"] = int(time.time() - self._start_time)
 
-            except Exception as e:
-                error_msg = f"Error stopping FileMonitor: {str(e)}"
-                logger.error(f"Shutdown error: {error_msg}")
-                raise FileMonitorError("ShutdownError", error_msg)
+            logger.info("FileMonitor stopped")
+
+        except Exception as e:
+            error_msg = f"Error stopping FileMonitor: {str(e)}"
+            logger.error(f"Shutdown error: {error_msg}")
+            raise FileMonitorError("ShutdownError", error_msg)
 
     def _handle_file_event(self, file_event: FileEvent) -> None:
         """
@@ -370,11 +382,52 @@ class FileMonitor:
         self.database_writer.reset_stats()
         self.performance_monitor.reset_stats()
 
+    def wait_idle(self, timeout: float = 2.0, quiet_period: float = 0.05) -> bool:
+        """
+        Block until the observer has dispatched every queued file event.
+
+        Waits on the observer queue's task accounting rather than polling,
+        then requires the queue to stay empty for quiet_period so events
+        still in flight from the OS are not missed.
+
+        Args:
+            timeout: Maximum seconds to wait
+            quiet_period: Seconds the queue must remain drained
+
+        Returns:
+            True if the monitor went idle, False if the timeout expired
+        """
+        observer = self.observer
+        if observer is None:
+            return True
+
+        event_queue = observer.event_queue
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with event_queue.all_tasks_done:
+                while event_queue.unfinished_tasks:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    event_queue.all_tasks_done.wait(remaining)
+
+            time.sleep(quiet_period)
+            if not event_queue.unfinished_tasks:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+
     @property
     def is_running(self) -> bool:
         """Check if the monitor is currently running."""
         return self._running
 
+    @property
+    def backend(self) -> str:
+        """Name of the filesystem event backend used by the observer."""
+        return OBSERVER_BACKEND
+
     def __enter__(self):
         """Context manager entry."""
         self.start()
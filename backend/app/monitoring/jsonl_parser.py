@@ -5,11 +5,14 @@ This module parses JSONL lines from Claude Code transcript files and converts
 them to structured Pydantic models for database storage.
 """
 
-import json
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
-from uuid import uuid4
+from typing import Any, Dict, Iterator, List, Literal, Optional, Union
+from uuid import UUID, uuid4
+
+import orjson
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict
 
 from app.models.contracts import (
     ParsedMessage,
@@ -21,6 +24,42 @@ from app.models.contracts import (
 logger = logging.getLogger(__name__)
 
 
+class ClaudeMessageBody(TypedDict):
+    """The ``message`` object of a Claude Code transcript line."""
+
+    role: Literal["user", "assistant"]
+    content: NotRequired[Any]
+
+
+class ClaudeLine(TypedDict):
+    """Fixed shape of a single Claude Code JSONL transcript line."""
+
+    uuid: str
+    sessionId: str
+    timestamp: str
+    type: str
+    message: ClaudeMessageBody
+    parentUuid: NotRequired[Optional[str]]
+
+
+# Parser statistics, in the order of JSONLParser's positional counters
+STAT_NAMES = ("lines_processed", "messages_parsed", "parse_errors", "validation_errors")
+(
+    STAT_LINES_PROCESSED,
+    STAT_MESSAGES_PARSED,
+    STAT_PARSE_ERRORS,
+    STAT_VALIDATION_ERRORS,
+) = range(len(STAT_NAMES))
+
+# First/last characters of a JSON object line, as text or bytes
+OBJECT_OPENERS = frozenset(("{", b"{"))
+OBJECT_CLOSERS = frozenset(("}", b"}"))
+
+# Built once at import: every line is checked against the same compiled
+# core schema instead of re-walking the required fields in Python.
+CLAUDE_LINE_VALIDATOR = TypeAdapter(ClaudeLine)
+
+
 class JSONLParser:
     """
     Parser for Claude Code JSONL transcript files.
@@ -31,106 +70,106 @@ class JSONLParser:
 
     def __init__(self):
         """Initialize the JSONL parser."""
-        self.stats = {
-            "lines_processed": 0,
-            "messages_parsed": 0,
-            "parse_errors": 0,
-            "validation_errors": 0,
-        }
+        # Positional counters, indexed by the STAT_* constants; a list index
+        # increment is cheaper than a string-keyed dict update on every line
+        self._counters: List[int] = [0] * len(STAT_NAMES)
 
         logger.info("JSONLParser initialized")
 
-    def parse_line(self, line: str) -> Union[ParsedMessage, ProcessingError]:
+    def parse_line(
+        self, line: Union[str, bytes], conversation_id: Optional[UUID] = None
+    ) -> Union[ParsedMessage, ProcessingError]:
         """
         Parse a single JSONL line into a ParsedMessage object.
 
         Args:
-            line: Raw JSONL line from transcript file
+            line: Raw JSONL line from transcript file, as text or UTF-8 bytes
+            conversation_id: Conversation the message belongs to; a new id is
+                generated when the caller does not know it yet
 
         Returns:
             ParsedMessage object on success, ProcessingError on failure
         """
-        self.stats["lines_processed"] += 1
+        self._counters[STAT_LINES_PROCESSED] += 1
+
+        # Every Claude line is a JSON object; reject anything else up front
+        # without paying for a raised and caught decode exception
+        stripped = line.strip()
+        if stripped[:1] not in OBJECT_OPENERS or stripped[-1:] not in OBJECT_CLOSERS:
+            return self._json_decode_error(
+                "Failed to parse JSON: line is not a JSON object", line
+            )
 
         try:
-            # Parse JSON
-            raw_data = json.loads(line.strip())
+            # Parse JSON (orjson reads UTF-8 bytes directly, no decode step)
+            raw_data = orjson.loads(stripped)
 
             # Extract and validate required fields
-            message = self._extract_message_data(raw_data)
+            message = self._extract_message_data(raw_data, conversation_id)
             if isinstance(message, ProcessingError):
-                self.stats["validation_errors"] += 1
+                self._counters[STAT_VALIDATION_ERRORS] += 1
                 return message
 
-            self.stats["messages_parsed"] += 1
+            self._counters[STAT_MESSAGES_PARSED] += 1
             return message
 
-        except json.JSONDecodeError as e:
-            self.stats["parse_errors"] += 1
-            error = ProcessingError(
-                error_type="JSONDecodeError",
-                error_message=f"Failed to parse JSON: {str(e)}",
-                component="JSONLParser",
-                original_event={"line": line[:200]},  # Truncate for logging
-            )
-            logger.warning(f"JSON parse error: {error}")
-            return error
+        except orjson.JSONDecodeError as e:
+            return self._json_decode_error(f"Failed to parse JSON: {str(e)}", line)
 
         except Exception as e:
-            self.stats["parse_errors"] += 1
+            self._counters[STAT_PARSE_ERRORS] += 1
             error = ProcessingError(
                 error_type="UnexpectedError",
                 error_message=f"Unexpected error parsing line: {str(e)}",
                 component="JSONLParser",
-                original_event={"line": line[:200]},
+                original_event={"line": self._line_preview(line)},
             )
             logger.error(f"Unexpected parse error: {error}")
             return error
 
+    def _json_decode_error(
+        self, error_message: str, line: Union[str, bytes]
+    ) -> ProcessingError:
+        """Record and build the ProcessingError for a line that is not valid JSON."""
+        self._counters[STAT_PARSE_ERRORS] += 1
+        error = ProcessingError(
+            error_type="JSONDecodeError",
+            error_message=error_message,
+            component="JSONLParser",
+            original_event={"line": self._line_preview(line)},
+        )
+        logger.warning(f"JSON parse error: {error}")
+        return error
+
+    @staticmethod
+    def _line_preview(line: Union[str, bytes]) -> str:
+        """Return the start of a raw line as text, truncated for logging."""
+        preview = line[:200]
+        if isinstance(preview, bytes):
+            return preview.decode("utf-8", errors="replace")
+        return preview
+
     def _extract_message_data(
-        self, raw_data: Dict[str, Any]
+        self, raw_data: Dict[str, Any], conversation_id: Optional[UUID] = None
     ) -> Union[ParsedMessage, ProcessingError]:
         """
         Extract and validate message data from parsed JSON.
 
         Args:
             raw_data: Parsed JSON data
+            conversation_id: Conversation id for the message, if already known
 
         Returns:
             ParsedMessage object on success, ProcessingError on failure
         """
         try:
-            # Validate required fields
-            required_fields = ["uuid", "sessionId", "timestamp", "type", "message"]
-            missing_fields = [
-                field for field in required_fields if field not in raw_data
-            ]
-
-            if missing_fields:
-                return ProcessingError(
-                    error_type="ValidationError",
-                    error_message=f"Missing required fields: {missing_fields}",
-                    component="JSONLParser",
-                    original_event={"data_keys": list(raw_data.keys())},
-                )
-
-            # Extract message content
-            message_data = raw_data["message"]
-            if not isinstance(message_data, dict) or "role" not in message_data:
-                return ProcessingError(
-                    error_type="ValidationError",
-                    error_message="Invalid message structure - missing role",
-                    component="JSONLParser",
-                )
+            try:
+                line_data = CLAUDE_LINE_VALIDATOR.validate_python(raw_data)
+            except ValidationError as e:
+                return self._line_validation_error(e, raw_data)
 
-            # Parse role
+            message_data = line_data["message"]
             role = message_data["role"]
-            if role not in ["user", "assistant"]:
-                return ProcessingError(
-                    error_type="ValidationError",
-                    error_message=f"Invalid role: {role}. Must be 'user' or 'assistant'",
-                    component="JSONLParser",
-                )
 
             # Extract content
             content = self._extract_content(message_data.get("content", ""))
@@ -141,7 +180,7 @@ class JSONLParser:
             # Parse timestamp
             try:
                 timestamp = datetime.fromisoformat(
-                    raw_data["timestamp"].replace("Z", "+00:00")
+                    line_data["timestamp"].replace("Z", "+00:00")
                 )
             except (ValueError, AttributeError) as e:
                 return ProcessingError(
@@ -152,9 +191,11 @@ class JSONLParser:
 
             # Create ParsedMessage
             return ParsedMessage(
-                conversation_id=uuid4(),  # This will be set properly by the conversation aggregator
-                message_id=raw_data["uuid"],
-                parent_id=raw_data.get("parentUuid"),
+                conversation_id=(
+                    conversation_id if conversation_id is not None else uuid4()
+                ),
+                message_id=line_data["uuid"],
+                parent_id=line_data.get("parentUuid"),
                 timestamp=timestamp,
                 role=role,
                 content=content,
@@ -168,6 +209,51 @@ class JSONLParser:
                 component="JSONLParser",
             )
 
+    def _line_validation_error(
+        self, error: ValidationError, raw_data: Any
+    ) -> ProcessingError:
+        """
+        Translate a line schema ValidationError into a ProcessingError.
+
+        Args:
+            error: ValidationError raised by CLAUDE_LINE_VALIDATOR
+            raw_data: Parsed JSON data that failed validation
+
+        Returns:
+            ProcessingError describing the first structural problem found
+        """
+        details = error.errors()
+        missing_fields = [
+            detail["loc"][0]
+            for detail in details
+            if detail["type"] == "missing" and len(detail["loc"]) == 1
+        ]
+
+        if missing_fields:
+            return ProcessingError(
+                error_type="ValidationError",
+                error_message=f"Missing required fields: {missing_fields}",
+                component="JSONLParser",
+                original_event={"data_keys": list(raw_data.keys())},
+            )
+
+        first = details[0]
+        if first["loc"][:1] == ("message",):
+            if first["loc"][1:] == ("role",) and first["type"] == "literal_error":
+                error_message = (
+                    f"Invalid role: {first['input']}. Must be 'user' or 'assistant'"
+                )
+            else:
+                error_message = "Invalid message structure - missing role"
+        else:
+            error_message = f"Invalid line structure: {first['msg']}"
+
+        return ProcessingError(
+            error_type="ValidationError",
+            error_message=error_message,
+            component="JSONLParser",
+        )
+
     def _extract_content(self, content_data: Union[str, List[Dict[str, Any]]]) -> str:
         """
         Extract text content from message content field.
@@ -255,29 +341,13 @@ class JSONLParser:
             ConversationData object on success, ProcessingError on failure
         """
         try:
-            messages = []
-            session_id = None
             project_id = uuid4()  # This should be determined by the file path
-
-            with open(file_path, "r", encoding="utf-8") as file:
-                for line_num, line in enumerate(file, 1):
-                    if not line.strip():
-                        continue
-
-                    result = self.parse_line(line)
-
-                    if isinstance(result, ProcessingError):
-                        logger.warning(
-                            f"Error parsing line {line_num} in {file_path}: {result}"
-                        )
-                        continue
-
-                    # Set consistent conversation_id and extract session_id
-                    if not session_id:
-                        # Extract session ID from first message (this is file-specific)
-                        session_id = f"file_{hash(file_path)}"  # Temporary - should be from actual data
-
-                    messages.append(result)
+            # Stamp the conversation id while parsing; assigning it afterwards
+            # would re-validate every message (validate_assignment)
+            conversation_id = uuid4()
+            messages = list(
+                self.parse_conversation_file_stream(file_path, conversation_id)
+            )
 
             if not messages:
                 return ProcessingError(
@@ -286,16 +356,15 @@ class JSONLParser:
                     component="JSONLParser",
                 )
 
-            # Set conversation_id for all messages
-            conversation_id = uuid4()
-            for message in messages:
-                message.conversation_id = conversation_id
+            # Extract session ID (this is file-specific)
+            # Temporary - should be from actual data
+            session_id = f"file_{hash(file_path)}"
 
             # Create conversation data
             conversation = ConversationData(
                 id=conversation_id,
                 project_id=project_id,
-                session_id=session_id or "unknown",
+                session_id=session_id,
                 title=f"Conversation from {file_path}",
                 message_count=len(messages),
                 messages=messages,
@@ -327,20 +396,50 @@ class JSONLParser:
                 component="JSONLParser",
             )
 
+    def parse_conversation_file_stream(
+        self, file_path: str, conversation_id: Optional[UUID] = None
+    ) -> Iterator[ParsedMessage]:
+        """
+        Parse a JSONL conversation file one message at a time.
+
+        Lines that fail to parse are logged and skipped. File errors such as
+        FileNotFoundError propagate to the caller.
+
+        Args:
+            file_path: Path to the JSONL file
+            conversation_id: Conversation id stamped on every message
+
+        Yields:
+            Each successfully parsed message, in file order
+        """
+        # Read raw bytes line by line; parse_line hands them straight to
+        # orjson. Buffered reads, not mmap, because Claude Code may still be
+        # appending to or truncating the file, and touching a mapped page
+        # past a truncated end raises SIGBUS instead of a catchable error.
+        with open(file_path, "rb") as file:
+            for line_num, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+
+                result = self.parse_line(line, conversation_id)
+
+                if isinstance(result, ProcessingError):
+                    logger.warning(
+                        f"Error parsing line {line_num} in {file_path}: {result}"
+                    )
+                    continue
+
+                yield result
+
     def get_stats(self) -> Dict[str, int]:
         """
         Get parsing statistics.
 
         Returns:
-            Dictionary of parsing statistics
+            Dictionary of parsing statistics, a copy of the current counters
         """
-        return self.stats.copy()
+        return dict(zip(STAT_NAMES, self._counters))
 
     def reset_stats(self) -> None:
         """Reset parsing statistics."""
-        self.stats = {
-            "lines_processed": 0,
-            "messages_parsed": 0,
-            "parse_errors": 0,
-            "validation_errors": 0,
-        }
+        self._counters[:] = [0] * len(STAT_NAMES)
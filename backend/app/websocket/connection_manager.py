@@ -3,15 +3,37 @@ WebSocket Connection Manager for Claude Code Observatory.
 
 Handles WebSocket connections, subscriptions, and real-time broadcasting.
 """
-import json
+import asyncio
+import contextvars
+import re
 import uuid
+import weakref
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, Set, List
+from fnmatch import translate
+from functools import lru_cache
+from typing import DefaultDict, Dict, Iterable, Set, List, MutableMapping, Optional, Pattern, Sequence, Tuple, Union
 from fastapi import WebSocket
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Subscription groups every manager starts with
+DEFAULT_SUBSCRIPTION_GROUPS = ("all_conversations", "project_updates", "file_events")
+WILDCARD_CHARS = frozenset("*?[")
+# Upper bound on socket writes a single broadcast keeps in flight at once
+MAX_CONCURRENT_SENDS = 64
+# Seconds a broadcast waits for its sends; clients still pending afterwards
+# are treated as failed and disconnected
+SEND_TIMEOUT_SECONDS = 5.0
+
+
+@lru_cache(maxsize=1024)
+def _compile_filter(pattern: str) -> Pattern[str]:
+    """Compile a glob-style subscription filter such as ``project:*`` once."""
+    return re.compile(translate(pattern))
+
 
 class ConnectionManager:
     """
@@ -20,69 +42,267 @@ class ConnectionManager:
     
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
-        self.subscriptions: Dict[str, Set[str]] = {
-            "all_conversations": set(),
-            "project_updates": set(),
-            "file_events": set(),
-        }
+        # Index of subscription filter -> subscribed client ids, kept up to
+        # date on subscribe/unsubscribe so broadcasts never scan every client
+        self.subscriptions: DefaultDict[str, Set[str]] = defaultdict(set)
+        for group in DEFAULT_SUBSCRIPTION_GROUPS:
+            self.subscriptions[group] = set()
+        self._wildcard_filters: Set[str] = set()
         self.client_metadata: Dict[str, dict] = {}
+        # One fan-out semaphore per event loop, created on first use there,
+        # so the module-global manager never holds one bound to a stale loop
+        self._send_semaphores: MutableMapping[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
 
-    async def connect(self, websocket: WebSocket, subscriptions: List[str] = None) -> str:
-        """Connect a new WebSocket client."""
+    async def connect(
+        self,
+        websocket: WebSocket,
+        subscriptions: List[str] = None,
+        client_id: Optional[str] = None,
+    ) -> str:
+        """Connect a new WebSocket client, generating an id unless one is given."""
         await websocket.accept()
         
-        client_id = str(uuid.uuid4())
+        client_id = client_id or str(uuid.uuid4())
         self.active_connections[client_id] = websocket
+        connected_at = datetime.utcnow()
         
         # Default subscriptions
         if not subscriptions:
             subscriptions = ["all_conversations", "file_events"]
         
-        # Add to subscription groups
-        for subscription in subscriptions:
-            if subscription in self.subscriptions:
-                self.subscriptions[subscription].add(client_id)
-        
         # Store client metadata
         self.client_metadata[client_id] = {
-            "connected_at": datetime.utcnow(),
-            "subscriptions": subscriptions,
+            "connected_at": connected_at,
+            "subscriptions": [],
             "message_count": 0
         }
+
+        # Add to subscription groups
+        self.subscribe(client_id, subscriptions)
         
-        # Send connection confirmation
+        # Send connection confirmation, stamped with the one connect time
+        server_time = connected_at.isoformat()
         await self._send_to_client(client_id, {
             "type": "connection_established",
             "data": {
                 "client_id": client_id,
                 "subscriptions": subscriptions,
-                "server_time": datetime.utcnow().isoformat()
+                "server_time": server_time
             },
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": server_time
         })
         
         logger.info(f"WebSocket client {client_id} connected")
         return client_id
 
+    def subscribe(self, client_id: str, subscriptions: Iterable[str]) -> None:
+        """
+        Add a connected client to one or more subscription filters.
+
+        Filters are exact keys (``file_events``, ``project:<uuid>``) or
+        glob patterns (``project:*``) matched against broadcast filters.
+        """
+        metadata = self.client_metadata.get(client_id)
+        if metadata is None:
+            raise ValueError(f"Client {client_id} not found")
+
+        for subscription in subscriptions:
+            if client_id in self.subscriptions[subscription]:
+                continue
+            self.subscriptions[subscription].add(client_id)
+            metadata["subscriptions"].append(subscription)
+            if WILDCARD_CHARS.intersection(subscription):
+                self._wildcard_filters.add(subscription)
+
+    def unsubscribe(self, client_id: str, subscriptions: Iterable[str]) -> None:
+        """Remove a client from one or more subscription filters."""
+        metadata = self.client_metadata.get(client_id)
+        for subscription in subscriptions:
+            subscribers = self.subscriptions.get(subscription)
+            if subscribers is None or client_id not in subscribers:
+                continue
+            subscribers.discard(client_id)
+            if metadata is not None:
+                metadata["subscriptions"].remove(subscription)
+            if not subscribers and subscription not in DEFAULT_SUBSCRIPTION_GROUPS:
+                del self.subscriptions[subscription]
+                self._wildcard_filters.discard(subscription)
+
+    def get_subscribers(self, subscription_filter: str) -> Set[str]:
+        """Return the client ids subscribed to a filter, including wildcard matches."""
+        subscribers = set(self.subscriptions.get(subscription_filter, ()))
+        for pattern in self._wildcard_filters:
+            if pattern != subscription_filter and _compile_filter(pattern).match(subscription_filter):
+                subscribers.update(self.subscriptions[pattern])
+        return subscribers
+
+    def has_subscribers(
+        self, subscription_filter: Optional[Union[str, Sequence[str]]] = None
+    ) -> bool:
+        """Cheap check for whether a broadcast to subscription_filter would reach anyone."""
+        if subscription_filter is None:
+            return bool(self.active_connections)
+        filters = (subscription_filter,) if isinstance(subscription_filter, str) else subscription_filter
+        for subscription in filters:
+            if self.subscriptions.get(subscription):
+                return True
+            for pattern in self._wildcard_filters:
+                if _compile_filter(pattern).match(subscription):
+                    return True
+        return False
+
     def disconnect(self, client_id: str):
         """Disconnect a WebSocket client."""
-        # Remove from all subscription groups
-        for subscription_set in self.subscriptions.values():
-            subscription_set.discard(client_id)
-        
+        # Remove from the client's own subscription groups
+        metadata = self.client_metadata.get(client_id)
+        if metadata is not None:
+            self.unsubscribe(client_id, list(metadata["subscriptions"]))
+
         # Clean up metadata
         self.active_connections.pop(client_id, None)
         self.client_metadata.pop(client_id, None)
         
         logger.info(f"WebSocket client {client_id} disconnected")
 
+    async def broadcast(
+        self,
+        message: dict,
+        subscription_filter: Optional[Union[str, Sequence[str]]] = None,
+        payload: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Broadcast a message to every client subscribed to subscription_filter
+        (all connected clients when no filter is given). A sequence of
+        filters reaches the union of their subscribers, each client once.
+
+        The message is serialized once (or not at all when the caller passes
+        the pre-encoded payload) and the same payload is written to all
+        subscribers concurrently; clients whose send fails or times out are
+        disconnected and returned.
+        """
+        client_ids: Set[str]
+        if subscription_filter is None:
+            client_ids = set(self.active_connections)
+        elif isinstance(subscription_filter, str):
+            client_ids = self.get_subscribers(subscription_filter)
+        else:
+            client_ids = set().union(*map(self.get_subscribers, subscription_filter))
+
+        # Nobody is listening: skip serialization and the fan-out entirely
+        if not client_ids:
+            return []
+
+        if payload is None:
+            payload = orjson.dumps(message).decode()
+
+        targets = [
+            (client_id, websocket)
+            for client_id in client_ids
+            if (websocket := self.active_connections.get(client_id)) is not None
+        ]
+        if not targets:
+            return []
+
+        failed_clients = self._record_results(
+            targets, await self._send_to_targets(targets, payload)
+        )
+        for client_id in failed_clients:
+            self.disconnect(client_id)
+
+        return failed_clients
+
+    async def _send_to_targets(
+        self, targets: List[Tuple[str, WebSocket]], payload: str
+    ) -> List[Optional[object]]:
+        """Send payload to every target; returns one failure (or None) per target."""
+        # A lone subscriber is sent to inline; no task is worth creating
+        if len(targets) == 1:
+            return [await self._send_single(targets[0][1], payload)]
+        return await self._fan_out(targets, payload)
+
+    def _record_results(
+        self, targets: List[Tuple[str, WebSocket]], errors: List[Optional[object]]
+    ) -> List[str]:
+        """Count delivered messages and return the clients whose send failed."""
+        failed_clients = []
+        for (client_id, _), error in zip(targets, errors):
+            if error is not None:
+                logger.warning(f"Broadcast to client {client_id} failed: {error}")
+                failed_clients.append(client_id)
+            elif client_id in self.client_metadata:
+                # The client may have disconnected while the sends were in flight
+                self.client_metadata[client_id]["message_count"] += 1
+        return failed_clients
+
+    async def _send_single(self, websocket: WebSocket, payload: str) -> Optional[object]:
+        """Send to one client inline; returns the failure, or None on success."""
+        try:
+            async with asyncio.timeout(SEND_TIMEOUT_SECONDS):
+                await websocket.send_text(payload)
+        except TimeoutError:
+            return "send timed out"
+        except Exception as e:
+            return e
+        return None
+
+    async def _fan_out(
+        self, targets: List[Tuple[str, WebSocket]], payload: str
+    ) -> List[Optional[object]]:
+        """
+        Send payload to every target concurrently and return one failure (or
+        None) per target, in order.
+
+        Small fan-outs write directly; larger ones share the manager's
+        semaphore for the running loop, so concurrent large broadcasts
+        together keep at most MAX_CONCURRENT_SENDS writes in flight. Every
+        send task shares one context copy, and one deadline covers the whole fan-out; sends still
+        pending at the deadline are cancelled and reported as timed out.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        if len(targets) > MAX_CONCURRENT_SENDS:
+            semaphore = self._send_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+                self._send_semaphores[loop] = semaphore
+            sends = (
+                self._bounded_send(semaphore, websocket, payload)
+                for _, websocket in targets
+            )
+        else:
+            sends = (websocket.send_text(payload) for _, websocket in targets)
+        tasks = [loop.create_task(send, context=context) for send in sends]
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=SEND_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+        for task in pending:
+            task.cancel()
+
+        return [
+            "send timed out" if task in pending or task.cancelled() else task.exception()
+            for task in tasks
+        ]
+
+    @staticmethod
+    async def _bounded_send(
+        semaphore: asyncio.Semaphore, websocket: WebSocket, payload: str
+    ) -> None:
+        """Send a pre-encoded payload while holding a fan-out slot."""
+        async with semaphore:
+            await websocket.send_text(payload)
+
     async def _send_to_client(self, client_id: str, message: dict):
         """Send message to specific client."""
         websocket = self.active_connections.get(client_id)
-        if not websocket:
+        if websocket is None:
             raise ValueError(f"Client {client_id} not found")
         
-        await websocket.send_text(json.dumps(message))
+        await websocket.send_text(orjson.dumps(message).decode())
         
         # Update client metrics
         if client_id in self.client_metadata:
@@ -8,18 +8,65 @@ Canon TDD Implementation - Test First Development
 """
 
 from fastapi import WebSocket, WebSocketDisconnect, Depends
+from pydantic import BaseModel
 from app.websocket.connection_manager import ConnectionManager
 from app.database.supabase_client import get_supabase_service_client
 import logging
-import json
-from typing import Dict, Any
+import orjson
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Subscription groups for conversation updates (plus the project filter)
+# and for file monitoring updates
+ALL_CONVERSATIONS_FILTER = "all_conversations"
+FILE_EVENTS_FILTER = "file_events"
+
 # Global connection manager instance
 connection_manager = ConnectionManager()
 
 
+def _build_update_message(
+    update_type: str, data: Union[Dict[str, Any], BaseModel]
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Build a broadcast message and its wire payload in a single pass.
+
+    Pydantic models are dumped to JSON-compatible data once here, and the
+    envelope is encoded once, so ConnectionManager never re-serializes the
+    message per subscriber.
+
+    Returns:
+        Tuple of (message dict, pre-encoded JSON payload)
+    """
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode="json")
+
+    message = {"type": update_type, "data": data}
+    return message, orjson.dumps(message).decode()
+
+
+@lru_cache(maxsize=1024)
+def _project_filter(project_id: Hashable) -> str:
+    """Return the subscription filter for a project, formatting each id once."""
+    return f"project:{project_id}"
+
+
+def _conversation_filters(
+    conversation_data: Union[Dict[str, Any], BaseModel]
+) -> Union[str, Tuple[str, str]]:
+    """Subscription filters for a conversation update: everyone plus its project."""
+    if isinstance(conversation_data, BaseModel):
+        project_id = getattr(conversation_data, "project_id", None)
+    else:
+        project_id = conversation_data.get("project_id")
+
+    if project_id is None:
+        return ALL_CONVERSATIONS_FILTER
+    return ALL_CONVERSATIONS_FILTER, _project_filter(project_id)
+
+
 async def websocket_endpoint(websocket: WebSocket, client_id: str = None):
     """
     WebSocket endpoint handler for real-time communication.
@@ -38,16 +85,26 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str = None):
     """
     try:
         # Connect client using ConnectionManager
-        await connection_manager.connect(websocket, client_id)
+        await connection_manager.connect(websocket, client_id=client_id)
         
         # Start message receiving loop
         while True:
-            message_text = await websocket.receive_text()
-            # Parse JSON message and process it
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000), frame.get("reason"))
+
+            # Parse JSON message and process it; orjson reads binary frames
+            # as UTF-8 directly, with no str decode first
+            raw = frame.get("bytes")
+            if raw is None:
+                raw = frame.get("text")
+            if raw is None:
+                # A receive frame without bytes or text carries no message
+                continue
             try:
-                message_data = json.loads(message_text)
+                message_data = orjson.loads(raw)
                 await handle_websocket_message(message_data, client_id)
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 # Invalid JSON - ignore for now, will be handled in future tests
                 pass
             
@@ -76,16 +133,30 @@ async def handle_websocket_message(
     - Validate message format and reject invalid messages
     - Integrate with database for data retrieval
     """
-    # Handle ping message type
-    if message.get("type") == "ping":
-        return {"type": "pong"}
-    
+    # Only string types can name a handler; an unhashable type such as a
+    # list would otherwise raise in the lookup
+    message_type = message.get("type")
+    handler = MESSAGE_HANDLERS.get(message_type) if isinstance(message_type, str) else None
+    if handler is not None:
+        return await handler(message, connection_id, db_client)
+
     # For unsupported message types, gracefully handle by returning an error response
     return {"error": "unsupported message type"}
 
 
+async def _handle_ping(message: Dict[str, Any], connection_id: str, db_client: Any) -> Dict[str, Any]:
+    """Answer a client ping with a pong."""
+    return {"type": "pong"}
+
+
+# Inbound message type -> handler(message, connection_id, db_client)
+MESSAGE_HANDLERS: Dict[str, Callable[[Dict[str, Any], str, Any], Awaitable[Dict[str, Any]]]] = {
+    "ping": _handle_ping,
+}
+
+
 async def broadcast_conversation_update(
-    conversation_data: Dict[str, Any],
+    conversation_data: Union[Dict[str, Any], BaseModel],
     update_type: str = "conversation_update"
 ):
     """
@@ -102,18 +173,21 @@ async def broadcast_conversation_update(
     - Include conversation metadata in updates
     - Filter recipients based on project/conversation relevance
     """
-    # Format message with type and data fields
-    message = {
-        "type": update_type,
-        "data": conversation_data
-    }
+    subscription_filter = _conversation_filters(conversation_data)
+    if not connection_manager.has_subscribers(subscription_filter):
+        return
+
+    # Format message with type and data fields, serialized once
+    message, payload = _build_update_message(update_type, conversation_data)
     
     # Use ConnectionManager to broadcast to relevant clients
-    await connection_manager.broadcast(message)
+    await connection_manager.broadcast(
+        message, subscription_filter=subscription_filter, payload=payload
+    )
 
 
 async def broadcast_file_monitoring_update(
-    file_data: Dict[str, Any],
+    file_data: Union[Dict[str, Any], BaseModel],
     update_type: str = "file_update"
 ):
     """
@@ -130,8 +204,14 @@ async def broadcast_file_monitoring_update(
     - Include performance metrics in updates
     - Maintain <50ms latency requirement
     """
-    # To be implemented based on test requirements
-    pass
+    if not connection_manager.has_subscribers(FILE_EVENTS_FILTER):
+        return
+
+    message, payload = _build_update_message(update_type, file_data)
+
+    await connection_manager.broadcast(
+        message, subscription_filter=FILE_EVENTS_FILTER, payload=payload
+    )
 
 
 def get_connection_manager() -> ConnectionManager:
@@ -0,0 +1,324 @@
+"""
+Test suite for ConnectionManager broadcasting.
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.websocket.connection_manager import MAX_CONCURRENT_SENDS, ConnectionManager
+
+
+def _mock_websocket() -> AsyncMock:
+    """Create a mock WebSocket that accepts every send."""
+    return AsyncMock(spec=WebSocket)
+
+
+class _FakeWebSocket:
+    """Minimal WebSocket stand-in for large fan-outs, where creating and
+    inspecting hundreds of AsyncMocks would dominate the test."""
+
+    __slots__ = ("sent",)
+
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload):
+        self.sent.append(payload)
+
+
+class TestConnectionManagerBroadcast:
+    """Test ConnectionManager.broadcast fan-out behavior."""
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_broadcast_sends_same_payload_to_subscribers_only(self):
+        """broadcast serializes once and reaches only the filtered subscribers."""
+        manager = ConnectionManager()
+        file_ws = _mock_websocket()
+        project_ws = _mock_websocket()
+        captured = []
+        file_ws.send_text.side_effect = lambda payload: captured.append(
+            json.loads(payload)
+        )
+        file_client = await manager.connect(file_ws, ["file_events"])
+        await manager.connect(project_ws, ["project_updates"])
+        project_ws.send_text.reset_mock()
+
+        assert captured[0]["type"] == "connection_established"
+        assert captured[0]["data"]["subscriptions"] == ["file_events"]
+
+        message = {"type": "file_update", "data": {"path": "/tmp/a.jsonl"}}
+        failed = await manager.broadcast(message, subscription_filter="file_events")
+
+        assert failed == []
+        project_ws.send_text.assert_not_called()
+        assert captured[1:] == [message]
+        assert manager.client_metadata[file_client]["message_count"] == 2
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_broadcast_without_filter_reaches_all_clients(self):
+        """broadcast with no filter targets every connected client."""
+        manager = ConnectionManager()
+        websockets = [_mock_websocket() for _ in range(3)]
+        for websocket in websockets:
+            await manager.connect(websocket, ["project_updates"])
+            websocket.send_text.reset_mock()
+
+        await manager.broadcast({"type": "system_status"})
+
+        for websocket in websockets:
+            websocket.send_text.assert_called_once_with('{"type":"system_status"}')
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_connect_with_client_id_keeps_default_subscriptions(self):
+        """A caller-supplied client id is used as-is, not as a subscription."""
+        manager = ConnectionManager()
+
+        client_id = await manager.connect(_mock_websocket(), client_id="client-1")
+
+        assert client_id == "client-1"
+        assert manager.client_metadata["client-1"]["subscriptions"] == [
+            "all_conversations",
+            "file_events",
+        ]
+        assert "client-1" not in manager.subscriptions
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_broadcast_disconnects_failed_clients(self):
+        """Clients whose send fails are reported and removed."""
+        manager = ConnectionManager()
+        healthy_ws = _mock_websocket()
+        failing_ws = _mock_websocket()
+        healthy_client = await manager.connect(healthy_ws)
+        failing_client = await manager.connect(failing_ws)
+        failing_ws.send_text.side_effect = WebSocketDisconnect
+
+        failed = await manager.broadcast(
+            {"type": "file_update"}, subscription_filter="file_events"
+        )
+
+        assert failed == [failing_client]
+        assert failing_client not in manager.active_connections
+        assert failing_client not in manager.subscriptions["file_events"]
+        assert healthy_client in manager.active_connections
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_broadcast_reaches_project_and_wildcard_subscribers(self):
+        """Per-project filters are indexed and glob filters match them."""
+        manager = ConnectionManager()
+        project_ws = _mock_websocket()
+        wildcard_ws = _mock_websocket()
+        other_ws = _mock_websocket()
+        project_client = await manager.connect(project_ws, ["project:abc"])
+        await manager.connect(wildcard_ws, ["project:*"])
+        await manager.connect(other_ws, ["project:xyz"])
+        for websocket in (project_ws, wildcard_ws, other_ws):
+            websocket.send_text.reset_mock()
+
+        await manager.broadcast(
+            {"type": "conversation_update"}, subscription_filter="project:abc"
+        )
+
+        project_ws.send_text.assert_called_once()
+        wildcard_ws.send_text.assert_called_once()
+        other_ws.send_text.assert_not_called()
+
+        manager.disconnect(project_client)
+        assert "project:abc" not in manager.subscriptions
+        assert (
+            manager.get_subscribers("project:abc") == manager.subscriptions["project:*"]
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_broadcast_to_several_filters_sends_once_per_client(self):
+        """A client matching more than one filter still receives a single frame."""
+        manager = ConnectionManager()
+        both_ws = _mock_websocket()
+        project_ws = _mock_websocket()
+        await manager.connect(both_ws, ["all_conversations", "project:abc"])
+        await manager.connect(project_ws, ["project:abc"])
+        both_ws.send_text.reset_mock()
+        project_ws.send_text.reset_mock()
+
+        await manager.broadcast(
+            {"type": "conversation_update"},
+            subscription_filter=("all_conversations", "project:abc"),
+        )
+
+        both_ws.send_text.assert_called_once()
+        project_ws.send_text.assert_called_once()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_broadcast_without_subscribers_skips_serialization(self):
+        """A filter nobody subscribes to returns before encoding the message."""
+        manager = ConnectionManager()
+        await manager.connect(_mock_websocket(), ["file_events"])
+
+        assert manager.has_subscribers("project:abc") is False
+        # An unserializable message proves the encode step never runs
+        assert (
+            await manager.broadcast(
+                {"data": object()}, subscription_filter="project:abc"
+            )
+            == []
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_broadcast_caps_sends_in_flight(self):
+        """Large fan-outs keep at most MAX_CONCURRENT_SENDS writes pending."""
+        manager = ConnectionManager()
+        in_flight = 0
+        peak = 0
+
+        class SlowWebSocket(_FakeWebSocket):
+            __slots__ = ()
+
+            async def send_text(self, payload):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0)
+                in_flight -= 1
+                self.sent.append(payload)
+
+        websockets = [SlowWebSocket() for _ in range(MAX_CONCURRENT_SENDS * 2)]
+        for websocket in websockets:
+            await manager.connect(websocket, ["file_events"])
+            websocket.sent.clear()
+
+        failed = await manager.broadcast(
+            {"type": "file_update"}, subscription_filter="file_events"
+        )
+
+        assert failed == []
+        assert peak == MAX_CONCURRENT_SENDS
+        # Identity against the first recipient's payload checks the message
+        # was encoded once, without comparing the string per client
+        payload = websockets[0].sent[0]
+        assert payload == '{"type":"file_update"}'
+        assert all(
+            len(websocket.sent) == 1 and websocket.sent[0] is payload
+            for websocket in websockets
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_concurrent_broadcasts_share_the_send_cap(self):
+        """Competing large fan-outs together keep MAX_CONCURRENT_SENDS writes pending."""
+        manager = ConnectionManager()
+        in_flight = 0
+        peak = 0
+
+        class SlowWebSocket(_FakeWebSocket):
+            __slots__ = ()
+
+            async def send_text(self, payload):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0)
+                in_flight -= 1
+                self.sent.append(payload)
+
+        for subscription in ("file_events", "project_updates"):
+            for _ in range(MAX_CONCURRENT_SENDS * 2):
+                await manager.connect(SlowWebSocket(), [subscription])
+
+        results = await asyncio.gather(
+            manager.broadcast(
+                {"type": "file_update"}, subscription_filter="file_events"
+            ),
+            manager.broadcast(
+                {"type": "project_update"}, subscription_filter="project_updates"
+            ),
+        )
+
+        assert results == [[], []]
+        assert peak == MAX_CONCURRENT_SENDS
+
+    def test_broadcast_caps_sends_on_each_event_loop(self):
+        """A manager shared across event loops keeps capping large fan-outs."""
+        manager = ConnectionManager()
+
+        class YieldingWebSocket(_FakeWebSocket):
+            __slots__ = ()
+
+            async def send_text(self, payload):
+                await asyncio.sleep(0)
+                self.sent.append(payload)
+
+        async def broadcast_to_new_clients():
+            for _ in range(MAX_CONCURRENT_SENDS * 2):
+                await manager.connect(YieldingWebSocket(), ["file_events"])
+            return await manager.broadcast(
+                {"type": "file_update"}, subscription_filter="file_events"
+            )
+
+        # Each run gets a fresh loop, like a reloaded app or test session;
+        # the loops are never installed, so the session loop is untouched
+        for _ in range(2):
+            loop = asyncio.new_event_loop()
+            try:
+                assert loop.run_until_complete(broadcast_to_new_clients()) == []
+            finally:
+                loop.close()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_broadcast_disconnects_clients_whose_send_stalls(self, monkeypatch):
+        """A send that exceeds the timeout fails that client without delaying others."""
+        monkeypatch.setattr(
+            "app.websocket.connection_manager.SEND_TIMEOUT_SECONDS", 0.01
+        )
+        manager = ConnectionManager()
+
+        class StalledWebSocket(_FakeWebSocket):
+            __slots__ = ()
+
+            async def send_text(self, payload):
+                await asyncio.Event().wait()
+
+        healthy_ws = _FakeWebSocket()
+        healthy_client = await manager.connect(healthy_ws, ["file_events"])
+        stalled_client = await manager.connect(_FakeWebSocket(), ["file_events"])
+        manager.active_connections[stalled_client] = StalledWebSocket()
+
+        failed = await manager.broadcast(
+            {"type": "file_update"}, subscription_filter="file_events"
+        )
+
+        assert failed == [stalled_client]
+        assert stalled_client not in manager.active_connections
+        assert healthy_ws.sent[-1] == '{"type":"file_update"}'
+        assert manager.client_metadata[healthy_client]["message_count"] == 2
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_broadcast_to_lone_subscriber_fails_on_timeout(self, monkeypatch):
+        """The inline single-target path still delivers and still times out."""
+        monkeypatch.setattr(
+            "app.websocket.connection_manager.SEND_TIMEOUT_SECONDS", 0.01
+        )
+        manager = ConnectionManager()
+        websocket = _FakeWebSocket()
+        client_id = await manager.connect(websocket, ["project:abc"])
+
+        assert (
+            await manager.broadcast({"type": "x"}, subscription_filter="project:abc")
+            == []
+        )
+        assert websocket.sent[-1] == '{"type":"x"}'
+
+        class StalledWebSocket(_FakeWebSocket):
+            __slots__ = ()
+
+            async def send_text(self, payload):
+                await asyncio.Event().wait()
+
+        manager.active_connections[client_id] = StalledWebSocket()
+        assert await manager.broadcast(
+            {"type": "x"}, subscription_filter="project:abc"
+        ) == [client_id]
+        assert client_id not in manager.active_connections
@@ -3,33 +3,32 @@ Test suite for File Monitor following Canon TDD approach.
 Tests written one at a time, with minimal implementation to pass each test.
 """
 
+import sys
 import pytest
 from datetime import datetime, timezone
 from uuid import uuid4
 from unittest.mock import MagicMock, patch
+
 from app.monitoring.file_monitor import FileMonitor, FileMonitorError
 from app.monitoring.database_writer import DatabaseWriter
 
+TEST_SUPABASE_ENV = {
+    'SUPABASE_URL': 'https://test.supabase.co',
+    'SUPABASE_KEY': 'test-key',
+    'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key',
+}
+
 
 class TestFileMonitor:
     """Test FileMonitor functionality following Canon TDD approach."""
 
-    def setup_method(self):
-        """Setup method to create test fixtures."""
-        import tempfile
-        self.temp_dir = tempfile.mkdtemp()
-        self.watch_path = self.temp_dir
-        
-    def teardown_method(self):
-        """Cleanup method to remove temporary directory."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
+    @pytest.fixture(autouse=True)
+    def _monitor_env(self, tmp_path, monkeypatch):
+        """Watch a fresh temporary directory with test Supabase settings."""
+        for name, value in TEST_SUPABASE_ENV.items():
+            monkeypatch.setenv(name, value)
+        self.watch_path = str(tmp_path)
+
     def test_monitor_initial_state_is_not_running(self):
         """First test: Monitor is not running immediately after initialization."""
         with patch('app.monitoring.file_monitor.DatabaseWriter') as mock_db_writer_class:
@@ -39,11 +38,6 @@ class TestFileMonitor:
                         monitor = FileMonitor(self.watch_path)
                         assert monitor._running is False, "Monitor should not be running initially."
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
     def test_monitor_can_be_started_and_stopped_and_updates_running_state(self):
         """Second test: Monitor can be started and stopped, updating _running state."""
         with patch('app.monitoring.file_monitor.DatabaseWriter') as mock_db_writer_class:
@@ -59,16 +53,13 @@ class TestFileMonitor:
                             # Call start() and assert state changes to True
                             monitor.start()
                             assert monitor._running is True, "Monitor should be running after start()."
+                            assert monitor.started.is_set(), "started should be set after start()."
 
                             # Call stop() and assert state changes back to False
                             monitor.stop()
                             assert monitor._running is False, "Monitor should not be running after stop()."
+                            assert not monitor.started.is_set(), "started should be cleared after stop()."
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
     def test_monitor_start_already_running_logs_warning(self):
         """Third test: Starting monitor when already running logs warning."""
         with patch('app.monitoring.file_monitor.DatabaseWriter'):
@@ -87,11 +78,6 @@ class TestFileMonitor:
                                 monitor.start()
                                 mock_logger.warning.assert_called_with("FileMonitor is already running")
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
     def test_monitor_stop_not_running_logs_warning(self):
         """Fourth test: Stopping monitor when not running logs warning."""
         with patch('app.monitoring.file_monitor.DatabaseWriter'):
@@ -105,11 +91,6 @@ class TestFileMonitor:
                             monitor.stop()
                             mock_logger.warning.assert_called_with("FileMonitor is not running")
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
     def test_monitor_start_creates_missing_watch_directory(self):
         """Fifth test: Monitor creates watch directory if it doesn't exist."""
         with patch('app.monitoring.file_monitor.DatabaseWriter'):
@@ -136,64 +117,54 @@ class TestFileMonitor:
     
     def test_handle_file_event_processes_file_successfully(self):
         """Seventh test: _handle_file_event processes file event successfully."""
-        with patch.dict('os.environ', {
-            'SUPABASE_URL': 'https://test.supabase.co',
-            'SUPABASE_KEY': 'test-key',
-            'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-        }):
-            with patch('app.monitoring.file_monitor.PerformanceMonitor') as mock_perf:
-                with patch('app.monitoring.file_monitor.DatabaseWriter') as mock_db_writer:
-                    with patch('app.monitoring.file_monitor.JSONLParser') as mock_parser:
-                        with patch('app.monitoring.file_monitor.ClaudeFileHandler'):
-                            # Create monitor
-                            monitor = FileMonitor("/tmp/test_dir")
-                            
-                            # Mock parser to return successful conversation data
-                            from app.models.contracts import ConversationData
-                            conversation_data = ConversationData(
-                                project_id=uuid4(),
-                                session_id="test-session",
-                                title="Test Conversation",
-                                message_count=1,
-                                messages=[]
-                            )
-                            monitor.jsonl_parser.parse_conversation_file.return_value = conversation_data
-                            
-                            # Mock database writer to return success
-                            conversation_id = uuid4()
-                            monitor.database_writer.write_conversation.return_value = (True, conversation_id, {"total_write_ms": 100.0})
-                            
-                            # Create file event
-                            from app.models.contracts import FileEvent, FileSystemEventType
-                            from pathlib import Path
-                            file_event = FileEvent(
-                                event_type=FileSystemEventType.CREATED,
-                                src_path=Path("/tmp/test_dir/test.jsonl"),
-                                is_directory=False,
-                                detected_at=datetime.now(timezone.utc)
-                            )
-                            
-                            # Call the method under test
-                            monitor._handle_file_event(file_event)
-                            
-                            # Verify parser was called
-                            monitor.jsonl_parser.parse_conversation_file.assert_called_once_with("/tmp/test_dir/test.jsonl")
-                            
-                            # Verify database writer was called
-                            monitor.database_writer.write_conversation.assert_called_once_with(conversation_data)
-                            
-                            # Verify performance monitor was called
-                            monitor.performance_monitor.record_metrics.assert_called_once()
-                            
-                            # Verify statistics were updated
-                            assert monitor.stats["files_processed"] == 1
-                            assert monitor.stats["conversations_created"] == 1
-
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
+        with patch('app.monitoring.file_monitor.PerformanceMonitor') as mock_perf:
+            with patch('app.monitoring.file_monitor.DatabaseWriter') as mock_db_writer:
+                with patch('app.monitoring.file_monitor.JSONLParser') as mock_parser:
+                    with patch('app.monitoring.file_monitor.ClaudeFileHandler'):
+                        # Create monitor
+                        monitor = FileMonitor("/tmp/test_dir")
+                        
+                        # Mock parser to return successful conversation data
+                        from app.models.contracts import ConversationData
+                        conversation_data = ConversationData(
+                            project_id=uuid4(),
+                            session_id="test-session",
+                            title="Test Conversation",
+                            message_count=1,
+                            messages=[]
+                        )
+                        monitor.jsonl_parser.parse_conversation_file.return_value = conversation_data
+                        
+                        # Mock database writer to return success
+                        conversation_id = uuid4()
+                        monitor.database_writer.write_conversation.return_value = (True, conversation_id, {"total_write_ms": 100.0})
+                        
+                        # Create file event
+                        from app.models.contracts import FileEvent, FileSystemEventType
+                        from pathlib import Path
+                        file_event = FileEvent(
+                            event_type=FileSystemEventType.CREATED,
+                            src_path=Path("/tmp/test_dir/test.jsonl"),
+                            is_directory=False,
+                            detected_at=datetime.now(timezone.utc)
+                        )
+                        
+                        # Call the method under test
+                        monitor._handle_file_event(file_event)
+                        
+                        # Verify parser was called
+                        monitor.jsonl_parser.parse_conversation_file.assert_called_once_with("/tmp/test_dir/test.jsonl")
+                        
+                        # Verify database writer was called
+                        monitor.database_writer.write_conversation.assert_called_once_with(conversation_data)
+                        
+                        # Verify performance monitor was called
+                        monitor.performance_monitor.record_metrics.assert_called_once()
+                        
+                        # Verify statistics were updated
+                        assert monitor.stats["files_processed"] == 1
+                        assert monitor.stats["conversations_created"] == 1
+
     def test_handle_file_event_skips_non_jsonl_files(self):
         """Eighth test: _handle_file_event skips files that are not JSONL."""
         with patch('app.monitoring.file_monitor.PerformanceMonitor'):
@@ -226,11 +197,6 @@ class TestFileMonitor:
                         assert monitor.stats["files_processed"] == 0
                         assert monitor.stats["conversations_created"] == 0
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
     def test_handle_file_event_skips_deleted_events(self):
         """Ninth test: _handle_file_event skips deleted events."""
         with patch('app.monitoring.file_monitor.PerformanceMonitor'):
@@ -263,11 +229,6 @@ class TestFileMonitor:
                         assert monitor.stats["files_processed"] == 0
                         assert monitor.stats["conversations_created"] == 0
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
     def test_handle_file_event_handles_parsing_error(self):
         """Tenth test: _handle_file_event handles parsing errors gracefully."""
         with patch('app.monitoring.file_monitor.PerformanceMonitor'):
@@ -310,11 +271,6 @@ class TestFileMonitor:
                         assert monitor.stats["files_processed"] == 0
                         assert monitor.stats["conversations_created"] == 0
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
     def test_handle_file_event_handles_database_write_failure(self):
         """Eleventh test: _handle_file_event handles database write failures."""
         with patch('app.monitoring.file_monitor.PerformanceMonitor'):
@@ -362,11 +318,6 @@ class TestFileMonitor:
                         assert monitor.stats["files_processed"] == 0
                         assert monitor.stats["conversations_created"] == 0
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
     def test_monitor_start_handles_observer_startup_error(self):
         """Sixth test: Monitor handles observer startup errors gracefully."""
         with patch('app.monitoring.file_monitor.DatabaseWriter'):
@@ -387,11 +338,6 @@ class TestFileMonitor:
                             assert exc_info.value.error_type == "StartupError"
                             assert "Observer startup failed" in str(exc_info.value)
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
     def test_get_health_returns_system_health_with_components(self):
         """Twelfth test: get_health returns SystemHealth with component statuses."""
         with patch('app.monitoring.file_monitor.PerformanceMonitor'):
@@ -420,11 +366,6 @@ class TestFileMonitor:
                                 assert "observer" in component_names
                                 assert "database" in component_names
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
     def test_get_stats_returns_comprehensive_statistics(self):
         """Thirteenth test: get_stats returns comprehensive monitoring statistics."""
         with patch('app.monitoring.file_monitor.PerformanceMonitor'):
@@ -460,11 +401,6 @@ class TestFileMonitor:
                         assert stats["performance_stats"] == {"avg_latency": 50.0}
                         assert stats["is_running"] == monitor._running
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
     def test_reset_stats_clears_all_statistics(self):
         """Fourteenth test: reset_stats clears all monitoring statistics."""
         with patch('app.monitoring.file_monitor.PerformanceMonitor'):
@@ -493,11 +429,6 @@ class TestFileMonitor:
                         monitor.database_writer.reset_stats.assert_called_once()
                         monitor.performance_monitor.reset_stats.assert_called_once()
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
     def test_is_running_property_returns_current_state(self):
         """Fifteenth test: is_running property returns current running state."""
         with patch('app.monitoring.file_monitor.PerformanceMonitor'):
@@ -518,11 +449,24 @@ class TestFileMonitor:
                         monitor._running = False
                         assert monitor.is_running is False
 
-    @patch.dict('os.environ', {
-        'SUPABASE_URL': 'https://test.supabase.co',
-        'SUPABASE_KEY': 'test-key',
-        'SUPABASE_SERVICE_ROLE_KEY': 'test-service-key'
-    })
+    def test_backend_names_the_native_observer_for_the_platform(self):
+        """Backend reports the native watchdog observer, not the polling fallback."""
+        expected = {
+            "linux": "inotify",
+            "darwin": "fsevents",
+            "win32": "read_directory_changes",
+        }.get(sys.platform)
+        if expected is None:
+            pytest.skip(f"No native watchdog observer expected on {sys.platform}")
+
+        with patch('app.monitoring.file_monitor.PerformanceMonitor'):
+            with patch('app.monitoring.file_monitor.DatabaseWriter'):
+                with patch('app.monitoring.file_monitor.JSONLParser'):
+                    with patch('app.monitoring.file_monitor.ClaudeFileHandler'):
+                        monitor = FileMonitor(self.watch_path)
+
+                        assert monitor.backend == expected
+
     def test_context_manager_starts_and_stops_monitor(self):
         """Sixteenth test: Context manager starts and stops monitor properly."""
         with patch('app.monitoring.file_monitor.PerformanceMonitor'):
@@ -541,4 +485,30 @@ class TestFileMonitor:
                                 assert monitor._running is True
                             
                             # Verify it's stopped after context exit
-                            assert monitor._running is False
\ No newline at end of file
+                            assert monitor._running is False
+
+    def test_wait_idle_returns_once_observer_queue_drains(self):
+        """Seventeenth test: wait_idle blocks until queued events are dispatched."""
+        import queue
+        import threading
+
+        with patch('app.monitoring.file_monitor.PerformanceMonitor'):
+            with patch('app.monitoring.file_monitor.DatabaseWriter'):
+                with patch('app.monitoring.file_monitor.JSONLParser'):
+                    with patch('app.monitoring.file_monitor.ClaudeFileHandler'):
+                        monitor = FileMonitor(self.watch_path)
+
+                        # No observer yet: nothing to wait for
+                        assert monitor.wait_idle(timeout=0.1) is True
+
+                        event_queue = queue.Queue()
+                        event_queue.put("pending-event")
+                        monitor.observer = MagicMock(event_queue=event_queue)
+
+                        # Still pending: times out
+                        assert monitor.wait_idle(timeout=0.1, quiet_period=0.01) is False
+
+                        # Dispatch finishes on another thread
+                        event_queue.get()
+                        threading.Timer(0.05, event_queue.task_done).start()
+                        assert monitor.wait_idle(timeout=1.0, quiet_period=0.01) is True
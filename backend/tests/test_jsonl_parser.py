@@ -45,6 +45,9 @@ class TestJSONLParser:
         # Verify that basic structure is present
         assert hasattr(result, 'messages'), "ConversationData should have messages attribute"
         assert isinstance(result.messages, list), "Messages should be a list"
+        assert all(
+            message.conversation_id == result.id for message in result.messages
+        ), "Every message should carry the conversation id"
     
     def test_parse_malformed_json_line_returns_processing_error(self):
         """Second test: parse_line correctly handles malformed JSON and returns ProcessingError."""
@@ -128,4 +131,72 @@ class TestJSONLParser:
         assert reset_stats["lines_processed"] == 0, "lines_processed was not reset to 0"
         assert reset_stats["messages_parsed"] == 0, "messages_parsed was not reset to 0"
         assert reset_stats["parse_errors"] == 0, "parse_errors was not reset to 0"
-        assert reset_stats["validation_errors"] == 0, "validation_errors was not reset to 0"
\ No newline at end of file
+        assert reset_stats["validation_errors"] == 0, "validation_errors was not reset to 0"
+
+    def test_parse_line_with_invalid_role_returns_validation_error(self):
+        """Fifth test: parse_line rejects roles outside the Claude line schema."""
+        invalid_role_line = json.dumps({
+            "uuid": "msg-004",
+            "sessionId": "session-123",
+            "timestamp": "2024-01-15T10:30:00Z",
+            "type": "system",
+            "message": {"role": "system", "content": "Hello"}
+        })
+        parser = JSONLParser()
+
+        result = parser.parse_line(invalid_role_line)
+
+        assert isinstance(result, ProcessingError), f"Expected ProcessingError, but got {type(result).__name__}"
+        assert result.error_type == "ValidationError"
+        assert "Invalid role: system" in result.error_message
+        assert parser.get_stats()["validation_errors"] == 1
+
+    def test_parse_line_accepts_raw_bytes(self):
+        """Sixth test: parse_line parses UTF-8 bytes without a decode step."""
+        line = json.dumps({
+            "uuid": "msg-005",
+            "sessionId": "session-123",
+            "timestamp": "2024-01-15T10:30:00Z",
+            "type": "user",
+            "message": {"role": "user", "content": "Héllo"}
+        }).encode("utf-8") + b"\n"
+        parser = JSONLParser()
+
+        result = parser.parse_line(line)
+
+        assert not isinstance(result, ProcessingError), f"Unexpected error: {result}"
+        assert result.message_id == "msg-005"
+        assert result.content == "Héllo"
+
+    def test_parse_file_without_trailing_newline_keeps_last_line(self, tmp_path: Path):
+        """Seventh test: the final line is parsed even without a newline terminator."""
+        lines = [
+            json.dumps({
+                "uuid": f"msg-{i}",
+                "sessionId": "session-123",
+                "timestamp": "2024-01-15T10:30:00Z",
+                "type": "user",
+                "message": {"role": "user", "content": f"line {i}"}
+            })
+            for i in range(3)
+        ]
+        file_path = tmp_path / "unterminated.jsonl"
+        file_path.write_text("\n\n".join(lines))
+        parser = JSONLParser()
+
+        result = parser.parse_conversation_file(str(file_path))
+
+        assert isinstance(result, ConversationData), f"Expected ConversationData, but got {type(result).__name__}"
+        assert [m.message_id for m in result.messages] == ["msg-0", "msg-1", "msg-2"]
+        assert parser.get_stats()["lines_processed"] == 3
+
+    def test_parse_conversation_file_stream_yields_messages_lazily(self, valid_jsonl_file: Path):
+        """Eighth test: the streaming parser yields ParsedMessages one at a time."""
+        parser = JSONLParser()
+
+        stream = parser.parse_conversation_file_stream(str(valid_jsonl_file))
+        first = next(stream)
+
+        assert first.message_id == "msg-001"
+        assert parser.get_stats()["lines_processed"] == 1
+        assert list(stream) == []
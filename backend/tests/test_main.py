@@ -1,9 +1,21 @@
 """Tests for FastAPI backend main application."""
 
+from typing import Iterator
+
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 
+@pytest.fixture(scope="module")
+def client() -> Iterator[TestClient]:
+    """TestClient shared by this module so the app lifespan runs once."""
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
 def test_fastapi_application_instance_is_created_successfully() -> None:
     """FastAPI application instance should be created with correct configuration."""
     # Given: we import the main application
@@ -34,12 +46,9 @@ def test_application_can_be_imported_from_app_main_module() -> None:
     assert callable(create_application)
 
 
-def test_root_endpoint_returns_success_response() -> None:
+def test_root_endpoint_returns_success_response(client: TestClient) -> None:
     """Root endpoint ('/') should return success response with correct message."""
-    # Given: a TestClient with the FastAPI app
-    from app.main import app
-
-    client = TestClient(app)
+    # Given: a TestClient with the FastAPI app (module fixture)
 
     # When: we make a GET request to the root endpoint
     response = client.get("/")
@@ -49,12 +58,9 @@ def test_root_endpoint_returns_success_response() -> None:
     assert response.json() == {"message": "Claude Code Observatory API"}
 
 
-def test_health_check_endpoint_returns_healthy_status() -> None:
+def test_health_check_endpoint_returns_healthy_status(client: TestClient) -> None:
     """Health check endpoint ('/health') should return healthy status."""
-    # Given: a TestClient with the FastAPI app
-    from app.main import app
-
-    client = TestClient(app)
+    # Given: a TestClient with the FastAPI app (module fixture)
 
     # When: we make a GET request to the health endpoint
     response = client.get("/health")
@@ -3,34 +3,77 @@ Performance benchmark tests for file monitoring system.
 
 Validates the <100ms detection latency SLA and other performance requirements
 under various load conditions and scenarios.
+
+Each benchmark watches its own temporary directory with its own observer, so
+the module can be spread across workers:
+    python -m pytest tests/test_performance_benchmarks.py -m performance -n 4
 """
 
 import asyncio
-import json
+import gc
+import os
 import tempfile
 import time
 import statistics
 from pathlib import Path
-from uuid import uuid4
+from typing import Optional
+from uuid import UUID, uuid4
 from concurrent.futures import ThreadPoolExecutor
+import orjson
 import pytest
 
-from app.monitoring.file_monitor import FileMonitor
+from app.monitoring.file_monitor import FileMonitor, OBSERVER_BACKEND
 from app.monitoring.performance_monitor import PerformanceMonitor
+from app.websocket.connection_manager import ConnectionManager
 from app.models.contracts import PerformanceMetrics, ComponentStatus
 
+NS_PER_SECOND = 1_000_000_000
+
+# 10KB of content for the large-message benchmark, built once
+LARGE_MESSAGE_BODY = "A" * 10000
+
+# JSONL line for the error-recovery benchmark; placeholders are substituted
+# per file so the harness never runs the JSON encoder in the timed loop
+VALID_MESSAGE_TEMPLATE = (
+    b'{"uuid": "__UUID__", "sessionId": "error-recovery-__INDEX__", '
+    b'"timestamp": "2024-01-15T10:30:00.000Z", "type": "message", '
+    b'"message": {"role": "user", "content": "Valid message __INDEX__"}}'
+)
+
 
 class TestPerformanceBenchmarks:
     """Performance benchmark tests for file monitoring system."""
 
+    @pytest.fixture(autouse=True)
+    def require_native_observer(self):
+        """Skip latency benchmarks when watchdog falls back to polling, whose
+        interval would be measured instead of event detection."""
+        if OBSERVER_BACKEND == "polling":
+            pytest.skip("watchdog has no native event backend on this platform")
+
     @pytest.fixture
-    def temp_claude_dir(self):
-        """Create a temporary Claude projects directory for testing."""
+    def temp_claude_dir(self, monkeypatch):
+        """
+        Create a temporary Claude projects directory for testing.
+
+        HOME points at the temporary directory, because ClaudeFileHandler only
+        accepts files under ~/.claude/projects; without it no event reaches
+        the monitor callback.
+        """
         with tempfile.TemporaryDirectory() as temp_dir:
-            claude_dir = Path(temp_dir) / ".claude" / "projects"
+            monkeypatch.setenv("HOME", temp_dir)
+            claude_dir = Path.home() / ".claude" / "projects"
             claude_dir.mkdir(parents=True)
             yield claude_dir
 
+    @pytest.fixture
+    def staging_dir(self, temp_claude_dir):
+        """Unwatched sibling directory where test files are written before
+        being renamed into the watched tree (one event per file)."""
+        staging = temp_claude_dir.parent / "staging"
+        staging.mkdir()
+        return staging
+
     @pytest.fixture
     def sample_message_content(self):
         """Generate sample message content for performance tests."""
@@ -45,68 +88,80 @@ class TestPerformanceBenchmarks:
             },
         }
 
+    @pytest.fixture
+    def sample_message_bytes(self, sample_message_content):
+        """Sample message content encoded once as a JSONL line."""
+        return orjson.dumps(sample_message_content)
+
     @pytest.mark.performance
     @pytest.mark.asyncio
     async def test_single_file_detection_latency(
-        self, temp_claude_dir, sample_message_content
+        self, temp_claude_dir, staging_dir, sample_message_bytes
     ):
         """Test detection latency for single file events."""
         latencies = []
+        loop = asyncio.get_running_loop()
+        file_processed = asyncio.Event()
 
         def timing_callback(conversation_data):
-            # Callback is called after processing, latency measured in monitor
-            pass
+            # Latency is measured in the monitor; the callback only signals
+            # that this file's sample is recorded
+            loop.call_soon_threadsafe(file_processed.set)
 
         monitor = FileMonitor(watch_path=str(temp_claude_dir), callback=timing_callback)
 
         try:
             monitor.start()
-            await asyncio.sleep(0.1)  # Ensure monitor is fully started
+            assert monitor.started.wait(timeout=1.0), "Monitor did not start"
 
             # Perform multiple single file tests
+            detection_latencies = monitor.performance_monitor.detection_latencies
             for i in range(20):
                 test_file = temp_claude_dir / f"single-test-{i}.jsonl"
 
-                # Create file and measure processing
-                test_file.write_text(json.dumps(sample_message_content))
+                # Let the previous file's events settle before clearing, so a
+                # late signal from it cannot satisfy this iteration's wait
+                await asyncio.to_thread(monitor.wait_idle, 1.0, 0.005)
+                file_processed.clear()
+                samples_seen = len(detection_latencies)
 
-                # Wait for processing
-                await asyncio.sleep(0.2)
+                # Staged rename: one created event per file
+                self._write_file(test_file, sample_message_bytes, staging_dir)
+
+                # Wait for processing instead of idling a fixed interval
+                try:
+                    await asyncio.wait_for(file_processed.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pytest.fail(f"File {i} was not processed within 1s")
 
-                # Collect latency data
-                if monitor.performance_monitor.detection_latencies:
-                    latest_latency = list(
-                        monitor.performance_monitor.detection_latencies
-                    )[-1]
-                    latencies.append(latest_latency)
+                # Collect latency data (deque tail access is O(1))
+                assert len(detection_latencies) > samples_seen
+                latencies.append(detection_latencies[-1])
 
             # Analyze latency results
-            if latencies:
-                avg_latency = statistics.mean(latencies)
-                max_latency = max(latencies)
-                p95_latency = statistics.quantiles(latencies, n=20)[
-                    18
-                ]  # 95th percentile
-                p99_latency = statistics.quantiles(latencies, n=100)[
-                    98
-                ]  # 99th percentile
-
-                # Performance assertions
-                assert (
-                    avg_latency < 50.0
-                ), f"Average latency {avg_latency:.2f}ms exceeds 50ms target"
-                assert (
-                    p95_latency < 100.0
-                ), f"95th percentile {p95_latency:.2f}ms exceeds 100ms SLA"
-                assert (
-                    p99_latency < 200.0
-                ), f"99th percentile {p99_latency:.2f}ms exceeds 200ms limit"
+            avg_latency = statistics.fmean(latencies)
+            max_latency = max(latencies)
+            # One sort yields every percentile cut point
+            percentiles = statistics.quantiles(latencies, n=100)
+            p95_latency = percentiles[94]  # 95th percentile
+            p99_latency = percentiles[98]  # 99th percentile
 
-                print(f"Single File Latency Results ({len(latencies)} samples):")
-                print(f"  Average: {avg_latency:.2f}ms")
-                print(f"  Max: {max_latency:.2f}ms")
-                print(f"  95th percentile: {p95_latency:.2f}ms")
-                print(f"  99th percentile: {p99_latency:.2f}ms")
+            # Performance assertions
+            assert (
+                avg_latency < 50.0
+            ), f"Average latency {avg_latency:.2f}ms exceeds 50ms target"
+            assert (
+                p95_latency < 100.0
+            ), f"95th percentile {p95_latency:.2f}ms exceeds 100ms SLA"
+            assert (
+                p99_latency < 200.0
+            ), f"99th percentile {p99_latency:.2f}ms exceeds 200ms limit"
+
+            print(f"Single File Latency Results ({len(latencies)} samples):")
+            print(f"  Average: {avg_latency:.2f}ms")
+            print(f"  Max: {max_latency:.2f}ms")
+            print(f"  95th percentile: {p95_latency:.2f}ms")
+            print(f"  99th percentile: {p99_latency:.2f}ms")
 
         finally:
             monitor.stop()
@@ -114,15 +169,20 @@ class TestPerformanceBenchmarks:
     @pytest.mark.performance
     @pytest.mark.asyncio
     async def test_concurrent_file_processing(
-        self, temp_claude_dir, sample_message_content
+        self, temp_claude_dir, staging_dir, sample_message_bytes
     ):
         """Test performance under concurrent file creation load."""
         processed_count = 0
         processing_times = []
+        loop = asyncio.get_running_loop()
+        all_processed = asyncio.Event()
 
         def concurrent_callback(conversation_data):
+            # Runs on the watchdog observer thread
             nonlocal processed_count
             processed_count += 1
+            if processed_count >= 50:
+                loop.call_soon_threadsafe(all_processed.set)
 
         monitor = FileMonitor(
             watch_path=str(temp_claude_dir), callback=concurrent_callback
@@ -130,34 +190,33 @@ class TestPerformanceBenchmarks:
 
         try:
             monitor.start()
-            await asyncio.sleep(0.1)
+            assert monitor.started.wait(timeout=1.0), "Monitor did not start"
 
             # Create multiple files concurrently
-            start_time = time.perf_counter()
-
-            tasks = []
-            for i in range(50):  # 50 concurrent files
-                task = asyncio.create_task(
-                    self._create_test_file(
-                        temp_claude_dir / f"concurrent-{i}.jsonl",
-                        sample_message_content,
+            start_ns = time.perf_counter_ns()
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                await asyncio.gather(
+                    *(
+                        self._create_test_file(
+                            temp_claude_dir / f"concurrent-{i}.jsonl",
+                            sample_message_bytes,
+                            executor,
+                            staging_dir,
+                        )
+                        for i in range(50)  # 50 concurrent files
                     )
                 )
-                tasks.append(task)
-
-            await asyncio.gather(*tasks)
 
-            # Wait for all processing to complete
+            # Wait for all processing to complete; a shortfall is reported
+            # by the processed_count assertion below
             max_wait_time = 10.0  # 10 seconds max wait
-            wait_start = time.perf_counter()
-
-            while (
-                processed_count < 50
-                and (time.perf_counter() - wait_start) < max_wait_time
-            ):
-                await asyncio.sleep(0.1)
+            try:
+                await asyncio.wait_for(all_processed.wait(), timeout=max_wait_time)
+            except asyncio.TimeoutError:
+                pass
 
-            total_time = time.perf_counter() - start_time
+            total_time = (time.perf_counter_ns() - start_ns) / NS_PER_SECOND
 
             # Analyze concurrent processing results
             stats = monitor.get_stats()
@@ -188,14 +247,47 @@ class TestPerformanceBenchmarks:
         finally:
             monitor.stop()
 
-    async def _create_test_file(self, file_path: Path, content: dict):
-        """Helper to create a test file asynchronously."""
-        file_path.write_text(json.dumps(content))
-        await asyncio.sleep(0.01)  # Small delay to simulate realistic file creation
+    async def _create_test_file(
+        self,
+        file_path: Path,
+        payload: bytes,
+        executor: ThreadPoolExecutor,
+        staging_dir: Optional[Path] = None,
+    ):
+        """Helper to create a test file on a worker thread."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            executor, self._write_file, file_path, payload, staging_dir
+        )
+
+    @staticmethod
+    def _write_file(
+        file_path: Path, payload: bytes, staging_dir: Optional[Path] = None
+    ):
+        """
+        Write payload to file_path with one open/write/close and no fsync.
+
+        With a staging_dir the file is written there and renamed into place,
+        so the watcher sees a single created event instead of
+        create/modify/close-write.
+        """
+        target = staging_dir / file_path.name if staging_dir else file_path
+        fd = os.open(
+            target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644
+        )
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+
+        if staging_dir:
+            os.rename(target, file_path)
 
     @pytest.mark.performance
     @pytest.mark.asyncio
-    async def test_large_message_processing_performance(self, temp_claude_dir):
+    async def test_large_message_processing_performance(
+        self, temp_claude_dir, staging_dir
+    ):
         """Test performance with large message content."""
         # Create large message content
         large_content = {
@@ -203,55 +295,63 @@ class TestPerformanceBenchmarks:
             "sessionId": "large-content-session",
             "timestamp": "2024-01-15T10:30:00.000Z",
             "type": "message",
-            "message": {"role": "assistant", "content": "A" * 10000},  # 10KB of content
+            "message": {"role": "assistant", "content": LARGE_MESSAGE_BODY},
         }
 
         processing_times = []
+        loop = asyncio.get_running_loop()
+        file_processed = asyncio.Event()
 
         def timing_callback(conversation_data):
-            # Processing time is captured in performance metrics
-            pass
+            # Processing time is captured in performance metrics; the
+            # callback only signals that this file's sample is recorded
+            loop.call_soon_threadsafe(file_processed.set)
 
         monitor = FileMonitor(watch_path=str(temp_claude_dir), callback=timing_callback)
 
         try:
             monitor.start()
-            await asyncio.sleep(0.1)
+            assert monitor.started.wait(timeout=1.0), "Monitor did not start"
 
             # Test multiple large messages
+            large_payload = orjson.dumps(large_content)
+            processing_latencies = monitor.performance_monitor.processing_latencies
+            samples_seen = 0
             for i in range(10):
                 test_file = temp_claude_dir / f"large-content-{i}.jsonl"
 
-                start_time = time.perf_counter()
-                test_file.write_text(json.dumps(large_content))
+                # Staged rename: exactly one event, so no stale signal can
+                # satisfy the next iteration's wait
+                file_processed.clear()
+                self._write_file(test_file, large_payload, staging_dir)
 
                 # Wait for processing
-                await asyncio.sleep(0.3)
+                try:
+                    await asyncio.wait_for(file_processed.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pytest.fail(f"Large file {i} was not processed within 1s")
 
                 # Record processing time from performance monitor
-                if monitor.performance_monitor.processing_latencies:
-                    latest_processing_time = list(
-                        monitor.performance_monitor.processing_latencies
-                    )[-1]
-                    processing_times.append(latest_processing_time)
+                assert len(processing_latencies) > samples_seen
+                samples_seen = len(processing_latencies)
+                processing_times.append(processing_latencies[-1])
 
             # Analyze large content processing
-            if processing_times:
-                avg_processing_time = statistics.mean(processing_times)
-                max_processing_time = max(processing_times)
+            avg_processing_time = statistics.fmean(processing_times)
+            max_processing_time = max(processing_times)
 
-                # Large content should still process within reasonable time
-                assert (
-                    avg_processing_time < 500.0
-                ), f"Large content avg processing {avg_processing_time:.2f}ms too slow"
-                assert (
-                    max_processing_time < 1000.0
-                ), f"Large content max processing {max_processing_time:.2f}ms too slow"
+            # Large content should still process within reasonable time
+            assert (
+                avg_processing_time < 500.0
+            ), f"Large content avg processing {avg_processing_time:.2f}ms too slow"
+            assert (
+                max_processing_time < 1000.0
+            ), f"Large content max processing {max_processing_time:.2f}ms too slow"
 
-                print(f"Large Content Processing Results:")
-                print(f"  Average processing time: {avg_processing_time:.2f}ms")
-                print(f"  Max processing time: {max_processing_time:.2f}ms")
-                print(f"  Content size: ~10KB per message")
+            print(f"Large Content Processing Results:")
+            print(f"  Average processing time: {avg_processing_time:.2f}ms")
+            print(f"  Max processing time: {max_processing_time:.2f}ms")
+            print(f"  Content size: ~10KB per message")
 
         finally:
             monitor.stop()
@@ -261,18 +361,23 @@ class TestPerformanceBenchmarks:
         """Test the overhead of performance monitoring itself."""
         monitor = PerformanceMonitor(max_samples=1000)
 
-        # Measure time to record many metrics
-        start_time = time.perf_counter()
-
-        for i in range(1000):
-            metrics = PerformanceMetrics(
+        # Build the samples up front so only record_metrics is timed
+        metrics_list = [
+            PerformanceMetrics(
                 detection_latency_ms=50.0 + (i % 50),
                 processing_latency_ms=100.0 + (i % 100),
                 throughput_msgs_per_sec=10.0 + (i % 10),
             )
+            for i in range(1000)
+        ]
+
+        # Measure time to record many metrics
+        start_ns = time.perf_counter_ns()
+
+        for metrics in metrics_list:
             monitor.record_metrics(metrics)
 
-        recording_time = time.perf_counter() - start_time
+        recording_time = (time.perf_counter_ns() - start_ns) / NS_PER_SECOND
 
         # Performance monitoring should be very fast
         assert (
@@ -280,18 +385,18 @@ class TestPerformanceBenchmarks:
         ), f"Recording 1000 metrics took {recording_time:.3f}s, too slow"
 
         # Test summary calculation performance
-        start_time = time.perf_counter()
+        start_ns = time.perf_counter_ns()
         summary = monitor.get_summary()
-        summary_time = time.perf_counter() - start_time
+        summary_time = (time.perf_counter_ns() - start_ns) / NS_PER_SECOND
 
         assert (
             summary_time < 0.05
         ), f"Summary calculation took {summary_time:.3f}s, too slow"
 
         # Test alerts calculation performance
-        start_time = time.perf_counter()
+        start_ns = time.perf_counter_ns()
         alerts = monitor.get_alerts()
-        alerts_time = time.perf_counter() - start_time
+        alerts_time = (time.perf_counter_ns() - start_ns) / NS_PER_SECOND
 
         assert (
             alerts_time < 0.05
@@ -304,30 +409,45 @@ class TestPerformanceBenchmarks:
 
     @pytest.mark.performance
     @pytest.mark.asyncio
-    async def test_memory_usage_stability(
-        self, temp_claude_dir, sample_message_content
-    ):
+    async def test_memory_usage_stability(self, temp_claude_dir, sample_message_bytes):
         """Test memory usage remains stable during extended operation."""
         import psutil
-        import os
 
         process = psutil.Process(os.getpid())
+        # Collect first so the baseline matches the per-batch samples
+        gc.collect()
         initial_memory = process.memory_info().rss / 1024 / 1024  # MB
 
         monitor = FileMonitor(watch_path=str(temp_claude_dir))
+        executor = ThreadPoolExecutor(max_workers=8)
 
         try:
             monitor.start()
-            await asyncio.sleep(0.1)
+            assert monitor.started.wait(timeout=1.0), "Monitor did not start"
 
             # Process many files to test memory stability
+            loop = asyncio.get_running_loop()
+
+            def write_batch(batch: int):
+                paths = [
+                    temp_claude_dir / f"memory-test-{batch}-{i}.jsonl"
+                    for i in range(20)
+                ]
+                list(
+                    executor.map(
+                        lambda path: self._write_file(path, sample_message_bytes), paths
+                    )
+                )
+
             for batch in range(10):  # 10 batches of 20 files each
-                for i in range(20):
-                    test_file = temp_claude_dir / f"memory-test-{batch}-{i}.jsonl"
-                    test_file.write_text(json.dumps(sample_message_content))
+                # Write off the event loop so monitor hand-offs are not blocked
+                await loop.run_in_executor(None, write_batch, batch)
+
+                # Wait for the monitor to drain the batch
+                await asyncio.to_thread(monitor.wait_idle, 2.0)
 
-                # Wait for batch processing
-                await asyncio.sleep(1.0)
+                # Collect garbage so growth reflects the monitor, not GC timing
+                gc.collect()
 
                 # Check memory after each batch
                 current_memory = process.memory_info().rss / 1024 / 1024
@@ -338,7 +458,8 @@ class TestPerformanceBenchmarks:
                     memory_growth < 100.0
                 ), f"Memory grew by {memory_growth:.1f}MB after batch {batch}"
 
-            final_memory = process.memory_info().rss / 1024 / 1024
+            # The last batch's sample already is the final reading
+            final_memory = current_memory
             total_growth = final_memory - initial_memory
 
             print(f"Memory Usage Results:")
@@ -352,18 +473,25 @@ class TestPerformanceBenchmarks:
             ), f"Total memory growth {total_growth:.1f}MB too high"
 
         finally:
+            executor.shutdown()
             monitor.stop()
 
     @pytest.mark.performance
     @pytest.mark.asyncio
-    async def test_error_recovery_performance(self, temp_claude_dir):
+    async def test_error_recovery_performance(self, temp_claude_dir, staging_dir):
         """Test performance impact of error conditions."""
         error_count = 0
         success_count = 0
+        valid_file_count = sum(1 for i in range(50) if i % 3 != 0)
+        loop = asyncio.get_running_loop()
+        valid_files_processed = asyncio.Event()
 
         def error_tracking_callback(conversation_data):
+            # Runs on the watchdog observer thread
             nonlocal success_count
             success_count += 1
+            if success_count >= valid_file_count:
+                loop.call_soon_threadsafe(valid_files_processed.set)
 
         monitor = FileMonitor(
             watch_path=str(temp_claude_dir), callback=error_tracking_callback
@@ -371,30 +499,48 @@ class TestPerformanceBenchmarks:
 
         try:
             monitor.start()
-            await asyncio.sleep(0.1)
-
-            start_time = time.perf_counter()
-
-            # Mix of valid and invalid files
-            for i in range(50):
-                if i % 3 == 0:  # Every 3rd file is invalid
-                    invalid_file = temp_claude_dir / f"invalid-{i}.jsonl"
-                    invalid_file.write_text("invalid json content")
-                else:  # Valid files
-                    valid_file = temp_claude_dir / f"valid-{i}.jsonl"
-                    valid_content = {
-                        "uuid": str(uuid4()),
-                        "sessionId": f"error-recovery-{i}",
-                        "timestamp": "2024-01-15T10:30:00.000Z",
-                        "type": "message",
-                        "message": {"role": "user", "content": f"Valid message {i}"},
-                    }
-                    valid_file.write_text(json.dumps(valid_content))
-
-            # Wait for processing
-            await asyncio.sleep(3.0)
-
-            total_time = time.perf_counter() - start_time
+            assert monitor.started.wait(timeout=1.0), "Monitor did not start"
+
+            # Mix of valid and invalid files, built before timing starts;
+            # uuids are sliced from one urandom read instead of 50 uuid4 calls
+            random_bytes = os.urandom(16 * 50)
+            valid_payloads = [
+                (
+                    temp_claude_dir / f"valid-{i}.jsonl",
+                    VALID_MESSAGE_TEMPLATE.replace(
+                        b"__UUID__",
+                        str(
+                            UUID(bytes=random_bytes[i * 16 : (i + 1) * 16], version=4)
+                        ).encode(),
+                    ).replace(b"__INDEX__", str(i).encode()),
+                )
+                for i in range(50)
+                if i % 3 != 0
+            ]
+            invalid_payloads = [
+                (temp_claude_dir / f"invalid-{i}.jsonl", b"invalid json content")
+                for i in range(50)
+                if i % 3 == 0  # Every 3rd file is invalid
+            ]
+
+            start_ns = time.perf_counter_ns()
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(
+                    executor.map(
+                        lambda item: self._write_file(item[0], item[1], staging_dir),
+                        valid_payloads + invalid_payloads,
+                    )
+                )
+
+            # Wait for every valid file, then for the invalid ones still queued
+            try:
+                await asyncio.wait_for(valid_files_processed.wait(), timeout=3.0)
+            except asyncio.TimeoutError:
+                pass
+            await asyncio.to_thread(monitor.wait_idle, 1.0)
+
+            total_time = (time.perf_counter_ns() - start_ns) / NS_PER_SECOND
             stats = monitor.get_stats()
 
             # Performance should not degrade significantly due to errors
@@ -429,6 +575,49 @@ class TestPerformanceBenchmarks:
             monitor.stop()
 
 
+class _NullWebSocket:
+    """WebSocket stand-in that accepts and discards every send."""
+
+    __slots__ = ()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload):
+        pass
+
+
+class TestBroadcastPerformance:
+    """Performance benchmarks for ConnectionManager broadcast fan-out."""
+
+    @pytest.mark.performance
+    @pytest.mark.asyncio
+    async def test_broadcast_cost_scales_linearly_with_subscribers(self):
+        """Per-client broadcast cost stays flat from 20 to 200 subscribers."""
+        message = {"type": "file_update"}
+
+        async def per_client_ns(count: int) -> float:
+            manager = ConnectionManager()
+            for _ in range(count):
+                await manager.connect(_NullWebSocket(), ["file_events"])
+            iterations = max(10, 1000 // count)
+            # Min of several repetitions filters out scheduler jitter
+            best = float("inf")
+            for _ in range(3):
+                start_ns = time.perf_counter_ns()
+                for _ in range(iterations):
+                    await manager.broadcast(message, subscription_filter="file_events")
+                best = min(best, (time.perf_counter_ns() - start_ns) / iterations)
+            return best / count
+
+        small = await per_client_ns(20)
+        large = await per_client_ns(200)
+
+        assert (
+            large < small * 3
+        ), f"Per-client cost grew from {small:.0f}ns to {large:.0f}ns"
+
+
 class TestPerformanceRegressionDetection:
     """Tests to detect performance regressions in the file monitoring system."""
 
@@ -437,37 +626,17 @@ class TestPerformanceRegressionDetection:
         """Establish baseline performance characteristics for regression testing."""
         monitor = PerformanceMonitor()
 
-        # Simulate baseline performance metrics
-        baseline_metrics = [
-            PerformanceMetrics(
-                detection_latency_ms=45.0,
-                processing_latency_ms=85.0,
-                throughput_msgs_per_sec=12.0,
-            ),
-            PerformanceMetrics(
-                detection_latency_ms=52.0,
-                processing_latency_ms=92.0,
-                throughput_msgs_per_sec=11.5,
-            ),
-            PerformanceMetrics(
-                detection_latency_ms=38.0,
-                processing_latency_ms=78.0,
-                throughput_msgs_per_sec=13.2,
-            ),
-            PerformanceMetrics(
-                detection_latency_ms=47.0,
-                processing_latency_ms=88.0,
-                throughput_msgs_per_sec=12.8,
-            ),
-            PerformanceMetrics(
-                detection_latency_ms=41.0,
-                processing_latency_ms=82.0,
-                throughput_msgs_per_sec=12.5,
-            ),
+        # Simulate baseline performance metrics as
+        # (detection_ms, processing_ms, throughput) samples
+        baseline_samples = [
+            (45.0, 85.0, 12.0),
+            (52.0, 92.0, 11.5),
+            (38.0, 78.0, 13.2),
+            (47.0, 88.0, 12.8),
+            (41.0, 82.0, 12.5),
         ]
 
-        for metrics in baseline_metrics:
-            monitor.record_metrics(metrics)
+        monitor.record_metrics_bulk(baseline_samples)
 
         summary = monitor.get_summary()
 
@@ -155,4 +155,40 @@ class TestPerformanceMonitor:
         
         # Verify that last_reset timestamp is updated
         post_reset_time = datetime.fromisoformat(post_reset_stats["last_reset"]) if isinstance(post_reset_stats["last_reset"], str) else post_reset_stats["last_reset"]
-        assert post_reset_time > initial_reset_time, "Post-reset: last_reset timestamp should be updated to a later time"
\ No newline at end of file
+        assert post_reset_time > initial_reset_time, "Post-reset: last_reset timestamp should be updated to a later time"
+
+    def test_record_metrics_bulk_matches_individual_records(self, performance_monitor):
+        """record_metrics_bulk updates buffers, violations and peaks like record_metrics."""
+        samples = [(45.0, 85.0, 12.0), (150.0, 92.0, 11.5), (38.0, 78.0, 13.2)]
+        reference = PerformanceMonitor()
+        for detection, processing, throughput in samples:
+            reference.record_metrics(
+                PerformanceMetrics(
+                    detection_latency_ms=detection,
+                    processing_latency_ms=processing,
+                    throughput_msgs_per_sec=throughput,
+                )
+            )
+
+        performance_monitor.record_metrics_bulk(samples)
+
+        assert list(performance_monitor.detection_latencies) == [45.0, 150.0, 38.0]
+        assert performance_monitor.stats["total_samples"] == 3
+        assert performance_monitor.stats["sla_violations"] == 1
+        summary = performance_monitor.get_summary()
+        expected = reference.get_summary()
+        for section in ("detection_latency", "processing_latency", "throughput", "peaks"):
+            assert summary[section] == expected[section]
+
+    def test_calculate_stats_matches_statistics_module(self, performance_monitor):
+        """_calculate_stats agrees with the statistics module on a single sort."""
+        import statistics
+
+        values = [38.0, 52.0, 45.0, 41.0, 47.0, 150.0]
+        stats = performance_monitor._calculate_stats(values)
+
+        assert stats["min"] == 38.0
+        assert stats["max"] == 150.0
+        assert stats["mean"] == pytest.approx(statistics.mean(values))
+        assert stats["median"] == pytest.approx(statistics.median(values))
+        assert stats["std_dev"] == pytest.approx(statistics.stdev(values))
@@ -131,4 +131,29 @@ class TestSupabaseClientManager:
                     
                     # Verify same client instance is returned
                     assert result1 is result2
-                    assert result1 is mock_client
\ No newline at end of file
+                    assert result1 is mock_client
+
+    def test_get_client_creates_client_once_under_concurrent_first_calls(self):
+        """Ninth test: concurrent first calls to get_client create a single client."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        manager = SupabaseClientManager()
+        barrier = threading.Barrier(8)
+
+        def slow_create(url, key):
+            # Widen the race window so unguarded creation would run twice
+            threading.Event().wait(0.01)
+            return MagicMock()
+
+        def first_call(_):
+            barrier.wait()
+            return manager.get_client()
+
+        with patch.object(manager.config, 'validate', return_value=True):
+            with patch('app.database.supabase_client.create_client', side_effect=slow_create) as mock_create:
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    clients = list(executor.map(first_call, range(8)))
+
+                mock_create.assert_called_once()
+                assert all(client is clients[0] for client in clients)
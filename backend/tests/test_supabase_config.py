@@ -5,9 +5,65 @@ This module tests that Supabase dependencies are properly installed and configur
 without instantiating actual clients to avoid network calls and version conflicts.
 """
 
+import importlib
 import os
+from pathlib import Path
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import Mock, patch
+
+from supabase import Client
+
+# Supabase client sub-packages followed by the extra testing dependencies,
+# each imported once by the parametrized availability test
+REQUIRED_DEPENDENCIES = (
+    "gotrue",
+    "postgrest",
+    "realtime",
+    "storage3",
+    "supafunc",
+    "aiofiles",
+    "asyncpg",
+    "psycopg2",
+)
+
+ENV_TEMPLATE_PATH = Path(__file__).resolve().parents[1] / "env.template"
+
+SUPABASE_ENV_VARS = ("SUPABASE_URL", "SUPABASE_KEY", "SUPABASE_SERVICE_ROLE_KEY")
+
+# An empty environment, then a fully configured one, each with the expected
+# url, key, service role key and validate() result
+ENV_CASES = [
+    ({}, None, None, None, False),
+    (
+        {
+            "SUPABASE_URL": "https://test-project.supabase.co",
+            "SUPABASE_KEY": "test-key",
+            "SUPABASE_SERVICE_ROLE_KEY": "test-service-key",
+        },
+        "https://test-project.supabase.co",
+        "test-key",
+        "test-service-key",
+        True,
+    ),
+]
+
+
+def _apply_env(monkeypatch, env):
+    """Replace the Supabase variables in os.environ with those in env."""
+    for name in SUPABASE_ENV_VARS:
+        if name in env:
+            monkeypatch.setenv(name, env[name])
+        else:
+            monkeypatch.delenv(name, raising=False)
+
+
+@pytest.fixture
+def supabase_config(request, monkeypatch):
+    """SupabaseConfig built once from the ENV_CASES entry passed indirectly."""
+    from app.database.supabase_client import SupabaseConfig
+
+    _apply_env(monkeypatch, request.param)
+    return SupabaseConfig()
 
 
 class TestSupabaseConfiguration:
@@ -15,113 +71,55 @@ class TestSupabaseConfiguration:
 
     def test_supabase_imports_available(self):
         """Test that all Supabase modules can be imported."""
-        # Test main supabase import
-        try:
-            import supabase
+        supabase = pytest.importorskip("supabase")
 
-            assert supabase is not None
-        except ImportError:
-            pytest.fail("supabase package not available")
-
-        # Test create_client function
-        try:
-            from supabase import create_client
-
-            assert create_client is not None
-        except ImportError:
-            pytest.fail("create_client function not available")
+        assert hasattr(supabase, "create_client")
+        assert hasattr(supabase, "Client")
 
-        # Test Client class
+    @pytest.mark.parametrize("dep", REQUIRED_DEPENDENCIES)
+    def test_dependency_available(self, dep):
+        """Test that each required Supabase and testing dependency is available."""
         try:
-            from supabase import Client
-
-            assert Client is not None
+            importlib.import_module(dep)
         except ImportError:
-            pytest.fail("Client class not available")
-
-    def test_supabase_dependencies_available(self):
-        """Test that required Supabase dependencies are available."""
-        dependencies = ["gotrue", "postgrest", "realtime", "storage3", "supafunc"]
-
-        for dep in dependencies:
-            try:
-                __import__(dep)
-            except ImportError:
-                pytest.fail(f"Required Supabase dependency '{dep}' not available")
+            pytest.fail(f"Required dependency '{dep}' not available")
 
-    def test_environment_variable_handling(self):
+    @pytest.mark.parametrize("env,url,key,service_key,valid", ENV_CASES)
+    def test_environment_variable_handling(
+        self, env, url, key, service_key, valid, monkeypatch
+    ):
         """Test environment variable configuration patterns."""
-        # Test missing environment variables
-        with patch.dict(os.environ, {}, clear=True):
-            url = os.environ.get("SUPABASE_URL")
-            key = os.environ.get("SUPABASE_KEY")
+        _apply_env(monkeypatch, env)
 
-            assert url is None
-            assert key is None
-
-        # Test with mock environment variables
-        test_env = {
-            "SUPABASE_URL": "https://test-project.supabase.co",
-            "SUPABASE_KEY": "test-key",
-            "SUPABASE_SERVICE_ROLE_KEY": "test-service-key",
-        }
-
-        with patch.dict(os.environ, test_env):
-            url = os.environ.get("SUPABASE_URL")
-            key = os.environ.get("SUPABASE_KEY")
-            service_key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-
-            assert url == test_env["SUPABASE_URL"]
-            assert key == test_env["SUPABASE_KEY"]
-            assert service_key == test_env["SUPABASE_SERVICE_ROLE_KEY"]
+        assert os.environ.get("SUPABASE_URL") == url
+        assert os.environ.get("SUPABASE_KEY") == key
+        assert os.environ.get("SUPABASE_SERVICE_ROLE_KEY") == service_key
 
     def test_supabase_client_manager_import(self):
         """Test that our custom client manager can be imported."""
-        try:
-            from app.database.supabase_client import SupabaseClientManager
+        from app.database import supabase_client
 
-            assert SupabaseClientManager is not None
-        except ImportError:
-            pytest.fail("SupabaseClientManager not available")
+        assert hasattr(supabase_client, "SupabaseClientManager")
 
-    def test_supabase_config_class(self):
+    @pytest.mark.parametrize(
+        "supabase_config,url,key,service_key,valid",
+        ENV_CASES,
+        indirect=["supabase_config"],
+    )
+    def test_supabase_config_class(self, supabase_config, url, key, service_key, valid):
         """Test the SupabaseConfig class."""
-        from app.database.supabase_client import SupabaseConfig
-
-        # Test with empty environment
-        with patch.dict(os.environ, {}, clear=True):
-            config = SupabaseConfig()
-            assert config.url is None
-            assert config.key is None
-            assert config.service_role_key is None
-            assert not config.validate()
-
-        # Test with valid environment
-        test_env = {
-            "SUPABASE_URL": "https://test.supabase.co",
-            "SUPABASE_KEY": "test-key",
-        }
-
-        with patch.dict(os.environ, test_env):
-            config = SupabaseConfig()
-            assert config.url == test_env["SUPABASE_URL"]
-            assert config.key == test_env["SUPABASE_KEY"]
-            assert config.validate()
+        assert supabase_config.url == url
+        assert supabase_config.key == key
+        assert supabase_config.service_role_key == service_key
+        assert supabase_config.validate() is valid
 
     def test_helper_functions_available(self):
         """Test that helper functions are available."""
-        try:
-            from app.database.supabase_client import (
-                get_supabase_client,
-                get_supabase_service_client,
-                shutdown_supabase,
-            )
-
-            assert get_supabase_client is not None
-            assert get_supabase_service_client is not None
-            assert shutdown_supabase is not None
-        except ImportError:
-            pytest.fail("Helper functions not available")
+        from app.database import supabase_client
+
+        assert callable(supabase_client.get_supabase_client)
+        assert callable(supabase_client.get_supabase_service_client)
+        assert callable(supabase_client.shutdown_supabase)
 
     @pytest.mark.asyncio
     async def test_pytest_asyncio_working(self):
@@ -132,24 +130,9 @@ class TestSupabaseConfiguration:
         await asyncio.sleep(0.001)
         assert True
 
-    def test_additional_testing_dependencies(self):
-        """Test that additional testing dependencies are available."""
-        dependencies = ["aiofiles", "asyncpg", "psycopg2"]
-
-        for dep in dependencies:
-            try:
-                __import__(dep)
-            except ImportError:
-                pytest.fail(f"Testing dependency '{dep}' not available")
-
     def test_environment_template_exists(self):
         """Test that environment template file exists."""
-        import os
-
-        template_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), "env.template"
-        )
-        assert os.path.exists(template_path), "env.template file not found"
+        assert ENV_TEMPLATE_PATH.is_file(), "env.template file not found"
 
     def test_supabase_version_compatibility(self):
         """Test that installed Supabase version is compatible."""
@@ -162,20 +145,20 @@ class TestSupabaseConfiguration:
             major, minor = map(int, version.split(".")[:2])
             assert major >= 2 and minor >= 3, f"Supabase version {version} too old"
 
-    def test_mock_client_creation_pattern(self):
+    @pytest.mark.parametrize("supabase_config", [ENV_CASES[1][0]], indirect=True)
+    def test_mock_client_creation_pattern(self, supabase_config):
         """Test the pattern for mocking Supabase client creation."""
         with patch("app.database.supabase_client.create_client") as mock_create:
-            mock_client = MagicMock()
-            mock_client.auth = MagicMock()
-            mock_client.table = MagicMock()
+            mock_client = Mock(spec=Client)
+            # auth is set in Client.__init__, so the class spec does not declare it
+            mock_client.auth = Mock()
             mock_create.return_value = mock_client
 
             # Test the import and mock pattern
             from app.database.supabase_client import SupabaseClientManager
 
             manager = SupabaseClientManager()
-            manager.config.url = "https://test.supabase.co"
-            manager.config.key = "test-key"
+            manager.config = supabase_config
 
             # This should work with proper mocking
             client = manager.get_client()
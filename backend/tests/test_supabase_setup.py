@@ -5,12 +5,21 @@ This module tests the Supabase client initialization and basic connectivity.
 Following TDD principles for the Claude Code Observatory project.
 """
 
+import asyncio
 import os
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import Mock, patch
 import supabase
 
 
+@pytest.fixture(scope="session")
+def sync_client_module():
+    """Resolve supabase's sync client module once for tests that patch it."""
+    from supabase._sync import client
+
+    return client
+
+
 class TestSupabaseSetup:
     """Test cases for Supabase client setup and configuration."""
 
@@ -57,14 +66,15 @@ class TestSupabaseSetup:
             "SUPABASE_KEY": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJlZiI6InRlc3QiLCJyb2xlIjoiYW5vbiIsImlhdCI6MTY0NjA2NzI2MiwiZXhwIjoxOTYxNjQzMjYyfQ.test_key",
         },
     )
-    @patch("supabase._sync.client.SyncClient")
-    def test_client_initialization_pattern(self, mock_sync_client):
+    def test_client_initialization_pattern(self, sync_client_module, monkeypatch):
         """Test the recommended client initialization pattern."""
         # Mock the SyncClient constructor to avoid network calls
-        mock_client_instance = MagicMock()
-        mock_client_instance.auth = MagicMock()
-        mock_client_instance.table = MagicMock()
-        mock_sync_client.return_value = mock_client_instance
+        mock_client_instance = Mock(spec=sync_client_module.SyncClient)
+        # auth is set in SyncClient.__init__, so the class spec does not declare it
+        mock_client_instance.auth = Mock()
+        monkeypatch.setattr(
+            sync_client_module, "SyncClient", Mock(return_value=mock_client_instance)
+        )
 
         # Follow the documented pattern
         url: str = os.environ.get("SUPABASE_URL")
@@ -127,7 +137,3 @@ class TestSupabaseSetup:
 
         # Test that the client can be created with proper parameters
         assert callable(supabase.create_client)
-
-
-# Import asyncio at module level for async test
-import asyncio
@@ -13,14 +13,18 @@ from unittest.mock import Mock, patch
 
 from app.main import app
 
-# Test client for FastAPI
-client = TestClient(app)
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient shared by this module so the app portal and lifespan start once."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 class TestWebSocketFoundation:
     """Test scenarios for WebSocket Foundation functionality."""
     
-    def test_websocket_endpoint_accepts_connections(self):
+    def test_websocket_endpoint_accepts_connections(self, client):
         """Should accept WebSocket connections at /ws endpoint."""
         # Given: WebSocket endpoint exists at /ws
         # When: WebSocket connection attempt is made